@@ -0,0 +1,68 @@
+"""Compare registry YAML loading paths on a synthetic bank.
+
+Usage: python scripts/bench_yaml.py [--bits 5000] [--repeat 3]
+"""
+
+import argparse
+import time
+
+import yaml
+
+from bits.yaml_loader import HAS_LIBYAML, BitsLoader, PyBitsLoader, load_yaml
+
+
+def make_bank(count: int) -> str:
+    lines = ["tags: [bench]", "bits:"]
+    for i in range(count):
+        lines += [
+            f"  - name: Bit {i}",
+            f"    tags: [t{i % 20}, kinematics]",
+            f"    num: {i}",
+            "    author: someone",
+            "    kind: exercise",
+            f"    level: {i % 5}",
+            "    defaults: { g: 9.81, unit: m/s }",
+            "    src: |",
+            f"      A body falls for \\VAR{{ t }} s from ${{root}}/{i}.",
+            "      Compute its speed in \\VAR{ unit }.",
+        ]
+    return "\n".join(lines) + "\n"
+
+
+def bench(label: str, load, src: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        load(src)
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<32} {best:8.3f} s")
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--bits", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    src = make_bank(args.bits)
+    print(f"{args.bits} bits, {len(src) / 1024:.0f} KB, libyaml: {HAS_LIBYAML}")
+    legacy = bench(
+        "FullLoader + implicit !var",
+        lambda s: yaml.load(s, Loader=yaml.FullLoader),
+        src,
+        args.repeat,
+    )
+    bench(
+        "pure-Python SafeLoader + pass",
+        lambda s: load_yaml(s, loader=PyBitsLoader),
+        src,
+        args.repeat,
+    )
+    if HAS_LIBYAML:
+        fast = bench("CSafeLoader + pass", load_yaml, src, args.repeat)
+        print(f"speedup over legacy: {legacy / fast:.1f}x ({BitsLoader.__name__})")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
+from collections import OrderedDict
 from typing import Dict, List, Union
 
 from jinja2 import Template
@@ -6,8 +7,12 @@ from .collections import Element
 from .dialects import DialectRegistry
 from .env import EnvironmentFactory
 from .exceptions import DialectError, TemplateLoadError, TemplateRenderError
+from .helpers import fingerprint
 from .models import BitModel
 
+# Compiled dialect outputs kept per bit (one per distinct relevant context)
+MAX_DIALECT_TEMPLATES = 32
+
 
 class Bit(Element):
     def __init__(  # pylint: disable=too-many-arguments
@@ -39,25 +44,14 @@ class Bit(Element):
 
         self.defaults: dict = defaults or {}
         self.presets: list = presets or []
+        self._fingerprinting = False
 
-        # Pre-compile template(s)
-        try:
-            if self.dialect:
-                self._template = None  # type: ignore[assignment]
-                self._templates = {}
-            elif isinstance(self.src, str):
-                self._template: Template = EnvironmentFactory.get().from_string(
-                    self.src
-                )
-                self._templates: Dict[str, Template] = {}
-            else:
-                self._template = None  # type: ignore[assignment]
-                self._templates = {
-                    key: EnvironmentFactory.get().from_string(val)
-                    for key, val in self.src.items()
-                }
-        except Exception as err:
-            raise TemplateLoadError(f"Unable to load bit source: \n\n{self}\n") from err
+        # Compiled on first render of each fragment (key None: single src);
+        # ``check`` compiles them all up front
+        self._templates: Dict[str | None, Template] = {}
+        # Dialect output compiled per (fragment, dialect version, hash of the
+        # context keys the transform depends on), least recently used first
+        self._dialect_templates: "OrderedDict[tuple, Template]" = OrderedDict()
 
     def __repr__(self) -> str:
         return f"Bit(src={self.src})"
@@ -94,7 +88,33 @@ class Bit(Element):
     def has_fragment(self, name: str) -> bool:
         if isinstance(self.src, dict):
             return name in self.src
-        return name in self._templates
+        return False
+
+    def _template_for(self, part: str | None) -> Template:
+        template = self._templates.get(part)
+        if template is None:
+            source = self.src if part is None else self.src[part]
+            try:
+                template = EnvironmentFactory.from_string(source)
+            except Exception as err:
+                raise TemplateLoadError(
+                    f"Unable to load bit source: \n\n{source}\n"
+                ) from err
+            self._templates[part] = template
+        return template
+
+    def check(self) -> None:
+        """Compile every fragment now instead of on first render.
+
+        Raises TemplateLoadError on syntax errors. For dialect bits only the
+        dialect itself is resolved: their source is not Jinja until transformed
+        with a render context.
+        """
+        if self.dialect:
+            DialectRegistry.resolve(self.dialect)
+            return
+        for part in [None] if isinstance(self.src, str) else list(self.src):
+            self._template_for(part)
 
     def render(self, part: str | None = None, **kwargs) -> str:
         context: dict = {**self.defaults}
@@ -102,9 +122,8 @@ class Bit(Element):
         try:
             if isinstance(self.src, str):
                 if self.dialect:
-                    source = self._apply_dialect(self.src, context)
-                    return EnvironmentFactory.get().from_string(source).render(context)
-                return self._template.render(context)
+                    return self._dialect_template(None, context).render(context)
+                return self._template_for(None).render(context)
 
             if not part:
                 if self.has_fragment("default"):
@@ -114,21 +133,45 @@ class Bit(Element):
                         "Bit has multiple fragments; specify 'part' to render one. "
                         f"Available: {', '.join(self.fragment_names)}"
                     )
-            if part not in self._templates:
-                if self.dialect and self.has_fragment(part):
-                    source = self._apply_dialect(self.src[part], context)
-                    return EnvironmentFactory.get().from_string(source).render(context)
+            if not self.has_fragment(part):
                 raise TemplateRenderError(
                     f"Unknown fragment '{part}'. Available: {', '.join(self.fragment_names)}"
                 )
-            return self._templates[part].render(context)
-        except DialectError:
+            if self.dialect:
+                return self._dialect_template(part, context).render(context)
+            return self._template_for(part).render(context)
+        except (DialectError, TemplateLoadError):
             raise
         except TemplateRenderError:
             raise
         except Exception as err:
             raise TemplateRenderError(f"Error rendering bit {self.id}") from err
 
+    def _dialect_template(self, part: str | None, context: dict) -> Template:
+        transform = DialectRegistry.resolve(self.dialect or "")
+        source = self.src if part is None else self.src[part]
+        keys = transform.context_keys
+        if keys is None:
+            # Depends on the whole context: hashing it (blocks, bits, ...) on
+            # every render would cost about as much as transforming. Identical
+            # outputs still share a compiled template (from_string).
+            return EnvironmentFactory.from_string(self._apply_dialect(source, context))
+        context_token = fingerprint(
+            [(key, key in context, context.get(key)) for key in keys]
+        )
+        cache_key = (part, transform.key, context_token)
+        cache = self._dialect_templates
+        template = cache.get(cache_key)
+        if template is not None:
+            cache.move_to_end(cache_key)
+            return template
+        template = EnvironmentFactory.from_string(self._apply_dialect(source, context))
+        cache[cache_key] = template
+        if len(cache) > MAX_DIALECT_TEMPLATES:
+            # Context-dependent dialects: keep the most recently used contexts
+            cache.popitem(last=False)
+        return template
+
     def _apply_dialect(self, source: str, context: dict) -> str:
         return DialectRegistry.transform(
             self.dialect or "",
@@ -143,6 +186,18 @@ class Bit(Element):
         metadata["id"] = str(self.id)
         return metadata
 
+    def fingerprint(self) -> str:
+        """Content hash of source, metadata and resolved defaults."""
+        if self._fingerprinting:
+            # Defaults may (indirectly) select this very bit
+            return f"{self.id}"
+        self._fingerprinting = True
+        try:
+            metadata = {k: v for k, v in self._metadata.items() if k != "id_"}
+            return fingerprint([self.src, metadata, self.defaults, self.presets])
+        finally:
+            self._fingerprinting = False
+
     def to_model(self) -> BitModel:
         return BitModel(
             name=self.name,
@@ -1,5 +1,6 @@
 # pylint: disable=too-few-public-methods
 from .bit import Bit
+from .helpers import fingerprint
 
 
 class _BlockFragment:
@@ -28,6 +29,9 @@ class Block:
         ctx = {**self.context, **extra}
         return self.bit.render(part=part, **ctx)
 
+    def fingerprint(self) -> str:
+        return fingerprint([self.bit, self.context, self.metadata])
+
     def has_fragment(self, name: str) -> bool:
         return self.bit.has_fragment(name)
 
@@ -0,0 +1,298 @@
+import configparser
+import hashlib
+import os
+import re
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+from .config import config
+
+DEFAULT_CACHE_DIR = ".bitscache"
+DEFAULT_PDF_CACHE_MAX_SIZE = 512 * 1024 * 1024
+DEFAULT_FMT_CACHE_MAX_SIZE = 256 * 1024 * 1024
+DEFAULT_REGISTRY_CACHE_MAX_SIZE = 128 * 1024 * 1024
+
+_SIZE_UNITS = {
+    "": 1,
+    "b": 1,
+    "k": 1024,
+    "kb": 1024,
+    "m": 1024**2,
+    "mb": 1024**2,
+    "g": 1024**3,
+    "gb": 1024**3,
+}
+
+
+def parse_size(value: str | int | None) -> int | None:
+    """Parse a human readable size such as ``512MB`` or ``2G`` into bytes.
+
+    Returns None for empty values; raises ValueError for malformed input.
+    """
+    if value is None:
+        return None
+    if isinstance(value, int):
+        return value
+    text = str(value).strip().lower()
+    if not text:
+        return None
+    match = re.match(r"^(\d+(?:\.\d+)?)\s*([a-z]*)$", text)
+    if not match or match.group(2) not in _SIZE_UNITS:
+        raise ValueError(f"Invalid size: {value}")
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2)])
+
+
+def format_size(size: int) -> str:
+    value = float(size)
+    for unit in ("B", "KB", "MB", "GB"):
+        if value < 1024 or unit == "GB":
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{size} B"  # pragma: no cover - unreachable
+
+
+def cache_dir(name: str) -> Path | None:
+    """Return the directory of a named on-disk cache, or None when caching is off.
+
+    All caches live under ``[cache] dir`` (default ``.bitscache``) and can be
+    disabled together with ``[cache] enabled = false``.
+    """
+    if not config.getboolean("cache", "enabled", fallback=True):
+        return None
+    root = config.get("cache", "dir", fallback=DEFAULT_CACHE_DIR) or DEFAULT_CACHE_DIR
+    return Path(root).expanduser() / name
+
+
+class FileCache:
+    """Content-addressed store of files under ``[cache] dir`` with size-bounded
+    LRU eviction.
+
+    Entries live in ``<directory>/<key[:2]>/<key><suffix>``. Each hit refreshes
+    the entry mtime, which is what eviction orders by. Subclasses name their
+    subdirectory, suffix and size limit option (``[cache] <name>_max_size``).
+    """
+
+    name: str = ""
+    suffix: str = ""
+    default_max_size: int | None = None
+    # ``[cache]`` option turning this cache off on its own, if any
+    toggle: str | None = None
+
+    def __init__(self, directory: Path, max_size: int | None = None):
+        self.directory: Path = directory
+        self.max_size: int | None = max_size
+
+    @classmethod
+    def from_config(cls):
+        directory = cache_dir(cls.name)
+        if directory is None or (
+            cls.toggle and not config.getboolean("cache", cls.toggle, fallback=True)
+        ):
+            return None
+        try:
+            max_size = parse_size(
+                config.get("cache", f"{cls.name}_max_size", fallback=None)
+            )
+        except ValueError:
+            max_size = None
+        if max_size is None:
+            max_size = cls.default_max_size
+        return cls(directory, max_size)
+
+    @staticmethod
+    def make_key(content: str, engine_id: str) -> str:
+        digest = hashlib.sha256()
+        digest.update(engine_id.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(content.encode("utf-8"))
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}{self.suffix}"
+
+    def fetch(self, key: str, dest: Path) -> bool:
+        """Copy the cached entry for ``key`` to ``dest``; return False on a miss."""
+        entry = self._entry_path(key)
+        if not entry.is_file():
+            return False
+        try:
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(str(entry), str(dest))
+        except OSError:
+            return False
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
+        return True
+
+    def store(self, key: str, file: Path) -> None:
+        """Store a compiled file. Failures are ignored: the cache is best-effort."""
+        self._publish(key, lambda tmp_name: shutil.copyfile(str(file), tmp_name))
+
+    def _publish(self, key: str, write: Callable[[str], object]) -> None:
+        entry = self._entry_path(key)
+        tmp_name = None
+        try:
+            entry.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=str(entry.parent), suffix=".tmp")
+            os.close(fd)
+            write(tmp_name)
+            # Atomic publish so concurrent builds never observe partial files
+            os.replace(tmp_name, str(entry))
+            tmp_name = None
+        except OSError:
+            return
+        finally:
+            if tmp_name is not None:
+                try:
+                    os.unlink(tmp_name)
+                except OSError:
+                    pass
+        if self.max_size is not None:
+            self.prune(self.max_size)
+
+    def _entries(self) -> List[Tuple[Path, os.stat_result]]:
+        entries = []
+        if not self.directory.is_dir():
+            return entries
+        for path in self.directory.glob(f"*/*{self.suffix}"):
+            try:
+                entries.append((path, path.stat()))
+            except OSError:
+                continue
+        return entries
+
+    def stats(self) -> Dict[str, object]:
+        entries = self._entries()
+        return {
+            "directory": self.directory,
+            "entries": len(entries),
+            "size": sum(st.st_size for _, st in entries),
+            "max_size": self.max_size,
+        }
+
+    def prune(self, max_size: int | None = None) -> int:
+        """Evict least recently used entries until the cache fits ``max_size``.
+
+        Returns the number of evicted entries.
+        """
+        limit = self.max_size if max_size is None else max_size
+        if limit is None:
+            return 0
+        entries = sorted(self._entries(), key=lambda item: item[1].st_mtime)
+        total = sum(st.st_size for _, st in entries)
+        removed = 0
+        for path, st in entries:
+            if total <= limit:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= st.st_size
+            removed += 1
+        return removed
+
+    def clear(self) -> int:
+        return self.prune(0)
+
+
+class PdfCache(FileCache):
+    """Compiled PDFs keyed by the TeX source and the engine that compiled it."""
+
+    name = "pdf"
+    suffix = ".pdf"
+    default_max_size = DEFAULT_PDF_CACHE_MAX_SIZE
+    toggle = "pdf"
+
+
+class FormatCache(FileCache):
+    """Precompiled LaTeX preambles (``.fmt`` files) keyed by preamble and engine."""
+
+    name = "fmt"
+    suffix = ".fmt"
+    default_max_size = DEFAULT_FMT_CACHE_MAX_SIZE
+
+
+class RegistryCache(FileCache):
+    """Parsed registry files (``RegistryDataModel`` as JSON) keyed by file
+    content, ``[variables]`` and bits version, so unchanged registries skip
+    YAML parsing and validation.
+
+    Entries are plain data: reading one never runs code, even from a shared
+    or checked-in cache directory.
+    """
+
+    name = "registry"
+    suffix = ".json"
+    default_max_size = DEFAULT_REGISTRY_CACHE_MAX_SIZE
+    toggle = "registry"
+
+    @staticmethod
+    def make_registry_key(path: Path, content: bytes) -> str:
+        from . import __version__  # pylint: disable=import-outside-toplevel
+
+        # ``${var}`` values are interpolated at parse time, relative ones
+        # against the working directory
+        try:
+            variables = sorted(config.items("variables"))
+        except configparser.NoSectionError:
+            variables = []
+        digest = hashlib.sha256()
+        for part in (__version__, path.suffix, str(Path.cwd()), repr(variables)):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        digest.update(content)
+        return digest.hexdigest()
+
+    def load(self, key: str) -> Any:
+        """Return the model stored under ``key``, or None on a miss."""
+        from .models import RegistryDataModel  # pylint: disable=import-outside-toplevel
+
+        entry = self._entry_path(key)
+        try:
+            model = RegistryDataModel.parse_raw(entry.read_bytes())
+        except Exception:  # pylint: disable=broad-except
+            # Missing, truncated, tampered with or from another model schema
+            return None
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
+        return model
+
+    def dump(self, key: str, model: Any) -> None:
+        data = model.json().encode("utf-8")
+        # Values JSON cannot represent as parsed (e.g. YAML dates) would come
+        # back different: do not cache those files
+        if type(model).parse_raw(data) != model:
+            return
+        self._publish(key, lambda tmp_name: Path(tmp_name).write_bytes(data))
+
+
+class BytecodeCache(FileCache):
+    """Compiled Jinja templates, one subdirectory per environment, under
+    ``[jinja] cache_dir`` (default ``<[cache] dir>/jinja``).
+
+    Jinja reads and writes the entries itself (``FileSystemBytecodeCache``);
+    this class only locates, counts and prunes them. There is no size limit
+    by default.
+    """
+
+    name = "jinja"
+    suffix = ".cache"
+
+    @classmethod
+    def from_config(cls) -> "BytecodeCache | None":
+        default = cache_dir(cls.name)
+        if default is None:
+            return None
+        root = config.get("jinja", "cache_dir", fallback="") or default
+        return cls(Path(root).expanduser(), cls.default_max_size)
+
+
+# Every cache kept under [cache] dir, as listed by ``bits cache``
+CACHES: Tuple[type, ...] = (PdfCache, FormatCache, RegistryCache, BytecodeCache)
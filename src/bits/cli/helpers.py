@@ -21,7 +21,10 @@ from ..exceptions import (
     RegistryError,
     TemplateError,
 )
+from ..env import EnvironmentFactory
+from ..helpers import normalize_path
 from ..registry import Registry, RegistryFactory
+from ..watcher import ChangeBatch
 
 
 def print_error(err: Exception, console: Console):
@@ -279,6 +282,7 @@ def initialize_registry(
     unique_strategy: str | None = None,
     output_name: str | None = None,
     all_outputs: bool = False,
+    jobs: int | None = None,
 ):
     """
     Initialize a registry from a path and render its targets.
@@ -291,6 +295,7 @@ def initialize_registry(
         console: Rich console instance for formatted output
         watch: Whether to continue trying if initialization fails
         output_tex: Whether to output TeX files
+        jobs: Number of concurrent LaTeX compiles (None: CPU count)
 
     Returns:
         Initialized Registry instance
@@ -328,6 +333,7 @@ def initialize_registry(
                 unique_strategy=unique_strategy,
                 output_name=output_name,
                 all_outputs=all_outputs,
+                jobs=jobs,
             )
             console.print("[bold green]Render complete.[/bold green]")
             print_render_summary(registry, console)
@@ -383,6 +389,7 @@ def watch_for_changes(
     unique_strategy: str | None = None,
     output_name: str | None = None,
     all_outputs: bool = False,
+    jobs: int | None = None,
     loop: bool = True,
 ):
     """
@@ -402,24 +409,31 @@ def watch_for_changes(
         intermediates_dir: Optional intermediates output dir
         keep_intermediates: Which intermediates to keep
         unique_strategy: Unique output naming strategy
+        jobs: Number of concurrent LaTeX compiles (None: CPU count)
         loop: Whether to run the blocking watch loop
     """
     last_error = None  # Track the last error to avoid repeating the same error messages
 
-    def reload_and_rerender(event):  # pylint: disable=unused-argument
+    def is_relevant(path: str) -> bool:
+        if path.endswith((".yml", ".yaml", ".md")):
+            return True
+        # Templates, plugins and dialect modules some target depends on
+        dependency_files = getattr(registry, "dependency_files", None)
+        return dependency_files is not None and (
+            str(normalize_path(path)) in dependency_files()
+        )
+
+    def reload_and_rerender(change):
         nonlocal last_error
 
-        # Only respond to changes in relevant files
-        if not (
-            event.src_path.endswith(".yml")
-            or event.src_path.endswith(".yaml")
-            or event.src_path.endswith(".md")
-        ):
+        # A batch of changes (or a single event): one rebuild for all of them,
+        # counting only relevant files
+        paths = [path for path in ChangeBatch.of(change).paths if is_relevant(path)]
+        if not paths:
             return
 
-        console.print(
-            f"[bold green]File change detected: {event.src_path}[/bold green]"
-        )
+        for path in paths:
+            console.print(f"[bold green]File change detected: {path}[/bold green]")
 
         try:
             console.print("[bold green]Re-rendering...[/bold green]")
@@ -427,7 +441,14 @@ def watch_for_changes(
             # Create a divider for visual separation
             console.rule("[bold]Build Started")
 
-            # Try to load and render the registry
+            # Plugins are loaded into cached environments: rebuild them
+            plugin_files = [
+                normalize_path(p) for p in EnvironmentFactory.plugin_files()
+            ]
+            if any(normalize_path(path) in plugin_files for path in paths):
+                EnvironmentFactory.clear_cache()
+
+            # Reload (incrementally) and render only the affected targets
             registry.load(as_dep=False)
             registry.render(
                 output_tex=output_tex,
@@ -440,6 +461,9 @@ def watch_for_changes(
                 unique_strategy=unique_strategy,
                 output_name=output_name,
                 all_outputs=all_outputs,
+                jobs=jobs,
+                only_dirty=True,
+                changed_paths=paths,
             )
 
             console.print("[bold green]Re-render complete.[/bold green]")
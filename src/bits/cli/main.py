@@ -15,6 +15,9 @@ from ..helpers import write as _write
 from ..config import config, load_config_file
 from ..registry.registryfile import RegistryFile as _RegistryFile
 from ..block import Block
+from ..cache import CACHES, format_size, parse_size
+from ..dependencies import DEPENDENCY_KINDS
+from ..exceptions import BitsError
 from ..helpers import normalize_path
 from jinja2 import Environment as _J2Environment
 from jinja2 import FileSystemLoader as _J2Loader
@@ -125,6 +128,13 @@ def render(
         "--all-outputs",
         help="Build all output variants defined on the target(s)",
     ),
+    jobs: Optional[int] = typer.Option(
+        None,
+        "--jobs",
+        "-j",
+        min=1,
+        help="Number of concurrent LaTeX compiles (default: CPU count)",
+    ),
 ):
     console.print("[bold green]Starting build process...[/bold green]")
     # Configure plugin loading before any template/env creation
@@ -194,6 +204,7 @@ def render(
         unique_strategy=unique,
         output_name=output,
         all_outputs=all_outputs,
+        jobs=jobs,
     )
 
     if watch:
@@ -211,6 +222,7 @@ def render(
             unique_strategy=unique,
             output_name=output,
             all_outputs=all_outputs,
+            jobs=jobs,
         )
 
 
@@ -448,6 +460,123 @@ def convert(
     registryfile.dump(out)
 
 
+@app.command(name="deps")
+def deps(
+    path: str,
+    target: Optional[str] = typer.Option(
+        None, "--target", help="Show a single target by name"
+    ),
+):
+    """Show what each target depends on: registries, templates, plugins,
+    dialect modules, bits and constants. Watch mode re-renders a target when
+    one of its files changes."""
+    registry = RegistryFactory.get(Path(path))
+    targets = [t for t in registry.targets if target is None or t.name == target]
+    if target is not None and not targets:
+        raise typer.BadParameter(f"Target not found: {target}")
+    for tgt in targets:
+        typer.echo(f"Target: {tgt.name or tgt.id}")
+        for kind in DEPENDENCY_KINDS:
+            entries = sorted(tgt.dependencies.get(kind, ()))
+            if not entries:
+                continue
+            typer.echo(f"  {kind}:")
+            for entry in entries:
+                typer.echo(f"    - {entry}")
+
+
+@app.command(name="check")
+def check(
+    path: str,
+    no_plugins: bool = typer.Option(
+        False,
+        "--no-plugins",
+        help="Disable loading Jinja plugins declared in .bitsrc",
+    ),
+):
+    """Compile every bit template of a registry (imports included) and report
+    syntax errors without rendering. Loading alone compiles bits lazily."""
+    EnvironmentFactory.enable_plugins(not no_plugins)
+    registry = RegistryFactory.get(Path(path))
+    failures = []
+    for bit in registry.bits:
+        try:
+            bit.check()
+        except BitsError as err:
+            failures.append((bit, err))
+    for bit, err in failures:
+        cause = err.__cause__ or err
+        where = bit._source_path or path  # pylint: disable=protected-access
+        line = getattr(cause, "lineno", None)
+        location = f"{where}: {bit.name or bit.id}" + (
+            f" (line {line})" if line else ""
+        )
+        typer.echo(f"{location}: {cause}", err=True)
+    if failures:
+        typer.echo(f"{len(failures)} of {len(registry.bits)} bits failed", err=True)
+        raise typer.Exit(1)
+    typer.echo(f"All {len(registry.bits)} bits compiled")
+
+
+cache_app = typer.Typer(help="Inspect and prune the on-disk caches.")
+app.add_typer(cache_app, name="cache")
+
+
+def _get_caches() -> list:
+    """The enabled caches under ``[cache] dir``: PDFs, preamble formats,
+    parsed registries and Jinja bytecode."""
+    caches = [cache for cache in (cls.from_config() for cls in CACHES) if cache]
+    if not caches:
+        console.print("[yellow]On-disk caches are disabled ([cache]).[/yellow]")
+        raise typer.Exit(0)
+    return caches
+
+
+@cache_app.command(name="stats")
+def cache_stats():
+    """Show location, entry count and size of each on-disk cache."""
+    entries = size = 0
+    for cache in _get_caches():
+        stats = cache.stats()
+        entries += stats["entries"]
+        size += stats["size"]
+        limit = (
+            f" (limit {format_size(stats['max_size'])})"
+            if stats["max_size"] is not None
+            else ""
+        )
+        console.print(
+            f"{cache.name + ':':10} {stats['entries']} entries,"
+            f" {format_size(stats['size'])}{limit} in {stats['directory']}"
+        )
+    console.print(f"{'Total:':10} {entries} entries, {format_size(size)}")
+
+
+@cache_app.command(name="prune")
+def cache_prune(
+    max_size: Optional[str] = typer.Option(
+        None,
+        "--max-size",
+        help="Evict least recently used entries until each cache fits (e.g. 200MB)",
+    ),
+    all_entries: bool = typer.Option(False, "--all", help="Remove every cached entry"),
+):
+    """Evict least recently used entries beyond each cache's size limit."""
+    try:
+        limit = parse_size(max_size)
+    except ValueError as err:
+        raise typer.BadParameter(str(err))
+    removed = entries = size = 0
+    for cache in _get_caches():
+        removed += cache.clear() if all_entries else cache.prune(limit)
+        stats = cache.stats()
+        entries += stats["entries"]
+        size += stats["size"]
+    console.print(
+        f"Removed {removed} cached file(s); {entries} left ({format_size(size)})."
+    )
+
+
 @app.command(name="init-config")
 def init_config():
     """Copy packaged defaults into ~/.bits (on demand)."""
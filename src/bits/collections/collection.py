@@ -1,16 +1,30 @@
 from __future__ import annotations
 
-from typing import Generic, List, MutableSequence, TypeVar
+from bisect import bisect_left
+from typing import Any, Dict, Generic, List, MutableSequence, Set, TypeVar
 
-from .element import Element
+from .element import Element, is_literal_name
 
 T = TypeVar("T", bound=Element)
 
+# Metadata fields answered from inverted indexes by ``Collection.filter``;
+# ``tags`` is matched per tag, the others by exact value.
+INDEXED_FIELDS = ("tags", "kind", "author", "level", "num")
+
 
 class Collection(Generic[T], MutableSequence[T]):
     def __init__(self, expected_type: type, collection: List[T] | None = None):
         self._expected_type = expected_type
         self._data = []
+        # id -> element, kept in sync on every mutation; positions are derived
+        # lazily since inserting or deleting in the middle shifts them.
+        self._by_id: Dict[str, T] = {}
+        self._positions: Dict[str, int] | None = {}
+        # field -> value -> positions, built on first use and dropped on
+        # mutation. A field with unhashable values is never indexed (None).
+        self._field_indexes: Dict[str, Dict[Any, List[int]] | None] = {}
+        # Sorted (name, position) pairs for prefix lookups of literal names
+        self._name_index: List[tuple] | None = None
         if collection:
             for element in collection:
                 self.append(element)
@@ -21,8 +35,12 @@ class Collection(Generic[T], MutableSequence[T]):
                 f"Expected type {self._expected_type}, but got {type(value)}"
             )
 
+    @staticmethod
+    def _key(id_) -> str:
+        return str(id_)
+
     def _check_if_already_exists(self, value: T) -> None:
-        if value.id in map(lambda e: e.id, self._data):
+        if self._key(value.id) in self._by_id:
             raise ValueError(f"Element with id {value.id} already exists")
 
     def _validate(self, value: T) -> None:
@@ -43,28 +61,155 @@ class Collection(Generic[T], MutableSequence[T]):
 
     def __setitem__(self, index: int, value: T) -> None:
         self._validate(value)
+        old = self._data[index]
         self._data[index] = value
+        del self._by_id[self._key(old.id)]
+        self._by_id[self._key(value.id)] = value
+        if self._positions is not None:
+            position = self._positions.pop(self._key(old.id))
+            self._positions[self._key(value.id)] = position
+        self._drop_indexes()
 
     def __delitem__(self, index: int) -> None:
+        removed = self._data[index]
         del self._data[index]
+        for element in removed if isinstance(index, slice) else [removed]:
+            del self._by_id[self._key(element.id)]
+        self._positions = None
+        self._drop_indexes()
+
+    def __contains__(self, value) -> bool:
+        if not isinstance(value, Element):
+            return False
+        return self._by_id.get(self._key(value.id)) is value
 
     def insert(self, index: int, value: T) -> None:
         self._validate(value)
+        appending = index >= len(self._data)
         self._data.insert(index, value)
+        self._by_id[self._key(value.id)] = value
+        if appending and self._positions is not None:
+            self._positions[self._key(value.id)] = len(self._data) - 1
+        else:
+            self._positions = None
+        self._drop_indexes()
+
+    def extend(self, values) -> None:
+        if values is self:
+            values = list(values)
+        for value in values:
+            self.insert(len(self._data), value)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._by_id.clear()
+        self._positions = {}
+        self._drop_indexes()
+
+    def index(self, value, start: int = 0, stop: int | None = None) -> int:
+        if value in self:
+            position = self.position_of(value.id)
+            if start <= position and (stop is None or position < stop):
+                return position
+        return super().index(value, start, len(self) if stop is None else stop)
 
     def find_by_id(self, id_: str) -> T | None:
-        element: T
-        for element in self._data:
-            if element.match_by_id(id_):
-                return element
-        raise ValueError(f"Element with id {id_} not found")
+        try:
+            return self._by_id[self._key(id_)]
+        except KeyError:
+            raise ValueError(f"Element with id {id_} not found") from None
+
+    def position_of(self, id_: str) -> int:
+        """Return the index of the element with id ``id_``."""
+        if self._positions is None:
+            self._positions = {
+                self._key(element.id): position
+                for position, element in enumerate(self._data)
+            }
+        try:
+            return self._positions[self._key(id_)]
+        except KeyError:
+            raise ValueError(f"Element with id {id_} not found") from None
+
+    def _drop_indexes(self) -> None:
+        self._field_indexes.clear()
+        self._name_index = None
+
+    def _names_starting_with(self, prefix: str) -> Set[int]:
+        if self._name_index is None:
+            self._name_index = sorted(
+                (element.name, position)
+                for position, element in enumerate(self._data)
+                if isinstance(element.name, str)
+            )
+        positions: Set[int] = set()
+        start = bisect_left(self._name_index, (prefix,))
+        for name, position in self._name_index[start:]:
+            if not name.startswith(prefix):
+                break
+            positions.add(position)
+        return positions
+
+    def _field_index(self, field: str) -> Dict[Any, List[int]] | None:
+        if field not in self._field_indexes:
+            index: Dict[Any, List[int]] | None = {}
+            try:
+                for position, element in enumerate(self._data):
+                    metadata = element._metadata  # pylint: disable=protected-access
+                    if field not in metadata:
+                        continue
+                    values = metadata[field] if field == "tags" else [metadata[field]]
+                    for value in values or []:
+                        postings = index.setdefault(value, [])
+                        if not postings or postings[-1] != position:
+                            postings.append(position)
+            except TypeError:
+                index = None
+            self._field_indexes[field] = index
+        return self._field_indexes[field]
+
+    def _candidates(self, name: str | None = None, **kwargs) -> List[int] | None:
+        """Positions that may match the indexed fields of a query, in order.
+
+        Returns None when no indexed field (or literal name) constrains the
+        query.
+        """
+        selected: Set[int] | None = None
+        if isinstance(name, str) and is_literal_name(name):
+            selected = self._names_starting_with(name)
+        for field in INDEXED_FIELDS:
+            value = kwargs.get(field)
+            if value is None:
+                continue
+            index = self._field_index(field)
+            if index is None:
+                continue
+            try:
+                keys = list(value) if field == "tags" else [value]
+                for key in keys:
+                    postings = set(index.get(key, ()))
+                    selected = postings if selected is None else selected & postings
+            except TypeError:
+                # Unhashable query value: leave it to the per-element check
+                continue
+            if not selected and selected is not None:
+                return []
+        return None if selected is None else sorted(selected)
 
     def filter(
         self, name: str | None = None, tags: List[str] | None = None, **kwargs
     ) -> Collection[T]:
         result: Collection[T] = Collection(self._expected_type)
+        candidates = self._candidates(name=name, tags=tags, **kwargs)
+        elements = (
+            self._data
+            if candidates is None
+            else [self._data[position] for position in candidates]
+        )
         element: T
-        for element in self._data:
+        for element in elements:
+            # Candidates still go through the full predicate, which also
+            # covers name patterns and non-indexed fields.
             if element.match_query(name=name, tags=tags, **kwargs):
                 result.append(element)
         return result
@@ -1,6 +1,22 @@
 import re
 import uuid
-from typing import List, Union
+from functools import lru_cache
+from typing import List, Pattern, Union
+
+# Characters that make a name query a regular expression rather than a
+# literal (prefix) match
+_REGEX_METACHARACTERS = frozenset(".^$*+?{}[]\\|()")
+
+
+@lru_cache(maxsize=256)
+def compile_name_pattern(name: str) -> Pattern[str]:
+    """Compiled pattern for a name query, shared across elements and queries."""
+    return re.compile(name)
+
+
+def is_literal_name(name: str) -> bool:
+    """Whether matching ``name`` reduces to a plain prefix comparison."""
+    return not _REGEX_METACHARACTERS.intersection(name)
 
 
 class Element:
@@ -32,12 +48,13 @@ class Element:
         return self._metadata["tags"]
 
     def match_by_id(self, id_: str) -> bool:
-        return self._metadata["id"] == id_
+        return str(self._metadata["id_"]) == str(id_)
 
     def match_by_name(self, name: str) -> bool:
         if self.name is not None:
-            pattern = re.compile(name)
-            match = pattern.match(self.name)
+            if is_literal_name(name):
+                return self.name.startswith(name)
+            match = compile_name_pattern(name).match(self.name)
             return bool(match)
         return False
 
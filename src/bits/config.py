@@ -31,7 +31,43 @@ except Exception:  # pragma: no cover - environment dependent
     # Fallback: continue without global defaults; local .bitsrc may provide paths
     pass
 
-config = configparser.ConfigParser(interpolation=ExtendedInterpolation())
+
+class BitsConfigParser(configparser.ConfigParser):
+    """ConfigParser counting its mutations in ``generation``.
+
+    Values derived from the config (e.g. Jinja environment keys) are cached
+    until the generation changes: any set, add/remove or (re)read bumps it.
+    """
+
+    generation: int = 0
+
+    def _changed(self) -> None:
+        self.generation += 1
+
+    def set(self, section, option, value=None):
+        super().set(section, option, value)
+        self._changed()
+
+    def add_section(self, section):
+        super().add_section(section)
+        self._changed()
+
+    def remove_section(self, section):
+        removed = super().remove_section(section)
+        self._changed()
+        return removed
+
+    def remove_option(self, section, option):
+        removed = super().remove_option(section, option)
+        self._changed()
+        return removed
+
+    def _read(self, fp, fpname):
+        super()._read(fp, fpname)
+        self._changed()
+
+
+config = BitsConfigParser(interpolation=ExtendedInterpolation())
 
 
 def _to_string(val: Any) -> str:
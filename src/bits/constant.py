@@ -7,6 +7,8 @@ class Constant(Element):
         super().__init__(name=name, tags=tags)
         self.symbol = symbol
         self.value = value
+        # Registry file that defined this constant (set by the loader)
+        self._source_path: str | None = None
 
     def __str__(self):
         return f"{self.symbol} = {self.value}"
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, Iterable, Set
+
+from jinja2 import Template, TemplateNotFound, meta
+
+from .bit import Bit
+from .block import Block
+from .constant import Constant
+from .dialects import DialectRegistry
+from .env import EnvironmentFactory
+from .helpers import normalize_path
+
+# Kinds of dependencies recorded per target; FILE_KINDS hold file paths, the
+# others hold bit/constant names.
+DEPENDENCY_KINDS = (
+    "registries",
+    "templates",
+    "plugins",
+    "dialects",
+    "bits",
+    "constants",
+)
+FILE_KINDS = ("registries", "templates", "plugins", "dialects")
+
+
+def empty_dependencies() -> Dict[str, Set[str]]:
+    return {kind: set() for kind in DEPENDENCY_KINDS}
+
+
+def template_files(template: Template) -> Set[str]:
+    """Files of ``template`` and of every template it statically extends,
+    includes or imports."""
+    env = template.environment
+    files: Set[str] = set()
+    pending = [template.filename] if template.filename else []
+    while pending:
+        filename = str(normalize_path(pending.pop()))
+        if filename in files:
+            continue
+        files.add(filename)
+        try:
+            source = Path(filename).read_text(encoding="utf-8")
+            referenced = list(meta.find_referenced_templates(env.parse(source)))
+        except Exception:  # pylint: disable=broad-except
+            # Unreadable or invalid templates surface when rendering
+            continue
+        for ref in referenced:
+            # Dynamic references (None) cannot be resolved statically
+            if ref is None or env.loader is None:
+                continue
+            try:
+                _, ref_filename, _ = env.loader.get_source(env, ref)
+            except TemplateNotFound:
+                continue
+            if ref_filename:
+                pending.append(ref_filename)
+    return files
+
+
+def collect_target_dependencies(
+    target, registries: Iterable[Path | str] = ()
+) -> Dict[str, Set[str]]:
+    """Record what ``target`` was resolved and renders from.
+
+    ``registries`` are the registry files consulted while resolving it (its
+    own file and those its queries reached); the registries that defined the
+    selected bits and constants are added to them.
+    """
+    deps = empty_dependencies()
+    deps["registries"].update(str(normalize_path(p)) for p in registries)
+
+    outputs = target._outputs  # pylint: disable=protected-access
+    for template in [target.template] + [out["template"] for out in outputs]:
+        deps["templates"].update(template_files(template))
+
+    contexts = [target.context] + [out["context"] for out in outputs]
+    _collect_from_value(contexts, deps, set())
+
+    deps["plugins"].update(
+        str(normalize_path(p)) for p in EnvironmentFactory.plugin_files()
+    )
+    return deps
+
+
+def _collect_from_value(value, deps: Dict[str, Set[str]], seen: Set[int]) -> None:
+    if id(value) in seen:
+        return
+    if isinstance(value, Block):
+        _collect_from_value(value.bit, deps, seen)
+        _collect_from_value(value.context, deps, seen)
+    elif isinstance(value, Bit):
+        seen.add(id(value))
+        deps["bits"].add(value.name or str(value.id))
+        source_path = value._source_path  # pylint: disable=protected-access
+        if source_path:
+            deps["registries"].add(str(normalize_path(source_path)))
+        if value.dialect:
+            module_path = DialectRegistry.module_path(value.dialect)
+            if module_path is not None:
+                deps["dialects"].add(str(normalize_path(module_path)))
+        _collect_from_value(value.defaults, deps, seen)
+    elif isinstance(value, Constant):
+        deps["constants"].add(value.name or str(value.id))
+        source_path = value._source_path  # pylint: disable=protected-access
+        if source_path:
+            deps["registries"].add(str(normalize_path(source_path)))
+    elif isinstance(value, dict):
+        seen.add(id(value))
+        for item in value.values():
+            _collect_from_value(item, deps, seen)
+    elif isinstance(value, (list, tuple, set)):
+        seen.add(id(value))
+        for item in value:
+            _collect_from_value(item, deps, seen)
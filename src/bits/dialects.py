@@ -11,17 +11,118 @@ from .config import config
 from .exceptions import DialectError
 
 Transform = Callable[..., str]
+DialectKey = Tuple[str, str, str, "int | None"]
+
+_TRANSFORM_KWARGS = ("context", "path", "metadata")
+_UNDECLARED = object()
+
+
+class BoundTransform:
+    """A resolved dialect transform with its calling convention worked out once.
+
+    ``key`` identifies the transform version (dialect name, module path,
+    function name and module mtime). ``context_keys`` tells which context keys
+    its output depends on: ``()`` for none, None for the whole context.
+    """
+
+    __slots__ = ("key", "function", "accepted", "context_keys")
+
+    def __init__(self, key: DialectKey, function: Transform):
+        self.key = key
+        self.function = function
+        # Keyword arguments the callable takes; None when it takes **kwargs
+        self.accepted: Tuple[str, ...] | None = self._accepted_kwargs(function)
+        self.context_keys: Tuple[str, ...] | None = self._context_keys(
+            function, self.accepted
+        )
+
+    def __call__(
+        self,
+        source: str,
+        *,
+        context: dict | None = None,
+        path: str | None = None,
+        metadata: dict | None = None,
+    ) -> str:
+        kwargs = {"context": context, "path": path, "metadata": metadata}
+        if self.accepted is None:
+            return self.function(source, **kwargs)
+        return self.function(source, **{key: kwargs[key] for key in self.accepted})
+
+    @staticmethod
+    def _accepted_kwargs(function: Transform) -> Tuple[str, ...] | None:
+        try:
+            parameters = inspect.signature(function).parameters
+        except (TypeError, ValueError):
+            return None
+        if any(
+            param.kind == inspect.Parameter.VAR_KEYWORD for param in parameters.values()
+        ):
+            return None
+        return tuple(
+            key
+            for key in _TRANSFORM_KWARGS
+            if key in parameters
+            and parameters[key].kind
+            in (
+                inspect.Parameter.KEYWORD_ONLY,
+                inspect.Parameter.POSITIONAL_OR_KEYWORD,
+            )
+        )
+
+    @staticmethod
+    def _context_keys(
+        function: Transform, accepted: Tuple[str, ...] | None
+    ) -> Tuple[str, ...] | None:
+        # Declared with a ``context_keys`` attribute on the transform;
+        # otherwise it depends on the whole context if it can receive it.
+        declared = getattr(function, "context_keys", _UNDECLARED)
+        if declared is not _UNDECLARED:
+            return None if declared is None else tuple(declared)
+        if accepted is None or "context" in accepted:
+            return None
+        return ()
 
 
 class DialectRegistry:
-    _cache: Dict[Tuple[str, str, str, int | None], Transform] = {}
+    _cache: Dict[DialectKey, BoundTransform] = {}
+    # name -> (generation, transform): resolutions trusted until refresh()
+    _resolved: Dict[str, Tuple[int, BoundTransform]] = {}
+    _generation: int = 0
 
     @classmethod
     def clear_cache(cls) -> None:
         cls._cache.clear()
+        cls._resolved.clear()
 
     @classmethod
-    def resolve(cls, name: str) -> Transform:
+    def refresh(cls) -> None:
+        """Re-check dialect config and module mtimes on the next resolve.
+
+        Called once per registry load (a build, or a watch event) so that
+        rendering does not stat dialect modules for every bit.
+        """
+        cls._generation += 1
+
+    @classmethod
+    def module_path(cls, name: str) -> Path | None:
+        """Path of the module implementing dialect ``name``, if configured."""
+        if not config.has_section("dialects") or not config.has_option(
+            "dialects", name
+        ):
+            return None
+        try:
+            module_path, _ = cls._parse_target(name, config.get("dialects", name))
+        except DialectError:
+            return None
+        return module_path
+
+    @classmethod
+    def resolve(cls, name: str) -> BoundTransform:
+        resolved = cls._resolved.get(name)
+        if resolved is not None and resolved[0] == cls._generation:
+            return resolved[1]
+
         if not config.has_section("dialects") or not config.has_option(
             "dialects", name
         ):
@@ -36,9 +137,19 @@ class DialectRegistry:
         mtime_ns = cls._module_mtime(module_path, name)
         cache_key = (name, module_path.as_posix(), function_name, mtime_ns)
 
-        if cache_key in cls._cache:
-            return cls._cache[cache_key]
+        bound = cls._cache.get(cache_key)
+        if bound is None:
+            bound = BoundTransform(
+                cache_key, cls._load_transform(name, module_path, function_name)
+            )
+            cls._cache[cache_key] = bound
+        cls._resolved[name] = (cls._generation, bound)
+        return bound
 
+    @classmethod
+    def _load_transform(
+        cls, name: str, module_path: Path, function_name: str
+    ) -> Transform:
         module = cls._load_module(name, module_path)
         try:
             transform = getattr(module, function_name)
@@ -56,8 +167,6 @@ class DialectRegistry:
                 dialect=name,
                 source_path=module_path.as_posix(),
             )
-
-        cls._cache[cache_key] = transform
         return transform
 
     @classmethod
@@ -72,8 +181,7 @@ class DialectRegistry:
     ) -> str:
         transform = cls.resolve(name)
         try:
-            result = cls._call_transform(
-                transform,
+            result = transform(
                 source,
                 context=context,
                 path=path,
@@ -159,39 +267,3 @@ class DialectRegistry:
                 cause=err,
             ) from err
         return module
-
-    @staticmethod
-    def _call_transform(
-        transform: Transform,
-        source: str,
-        *,
-        context: dict | None,
-        path: str | None,
-        metadata: dict | None,
-    ) -> str:
-        kwargs = {
-            "context": context,
-            "path": path,
-            "metadata": metadata,
-        }
-
-        try:
-            signature = inspect.signature(transform)
-        except (TypeError, ValueError):
-            return transform(source, **kwargs)
-
-        params = signature.parameters.values()
-        if any(param.kind == inspect.Parameter.VAR_KEYWORD for param in params):
-            return transform(source, **kwargs)
-
-        accepted_kwargs = {
-            key: value
-            for key, value in kwargs.items()
-            if key in signature.parameters
-            and signature.parameters[key].kind
-            in (
-                inspect.Parameter.KEYWORD_ONLY,
-                inspect.Parameter.POSITIONAL_OR_KEYWORD,
-            )
-        }
-        return transform(source, **accepted_kwargs)
@@ -0,0 +1,269 @@
+import re
+import subprocess
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Type
+
+from .config import config
+from .exceptions import ConfigError
+
+DEFAULT_ENGINE = "pdflatex"
+
+# Common LaTeX error patterns, most specific first
+_ERROR_PATTERNS = [
+    # Look for lines containing "! LaTeX Error:"
+    r"! LaTeX Error: ([^\n\r]*)",
+    # Look for lines containing "! Package error:"
+    r"! Package [^\n\r]* Error: ([^\n\r]*)",
+    # Look for any other error
+    r"! ([^\n\r]*)",
+]
+
+
+def extract_error_from_log(log_file: Path) -> Optional[str]:
+    """
+    Extract the most relevant error message from a LaTeX log file.
+
+    Args:
+        log_file: Path to the LaTeX log file
+
+    Returns:
+        A string containing the extracted error message or None if no error was found
+    """
+    if not log_file.exists():
+        return None
+
+    try:
+        with open(log_file, "r", encoding="utf-8", errors="ignore") as f:
+            log_content = f.read()
+
+        for pattern in _ERROR_PATTERNS:
+            matches = re.search(pattern, log_content)
+            if matches and matches.group(1):
+                return matches.group(1).strip()
+
+        return None
+    except Exception:
+        # If anything goes wrong while parsing the log, just return None
+        return None
+
+
+class TexEngine(ABC):
+    """A TeX backend: how to invoke it, where its outputs land, how to read errors.
+
+    Engines run in a work directory prepared by the Renderer and must raise
+    ``subprocess.CalledProcessError`` when compilation fails.
+    """
+
+    name: str = ""
+    executable: str = ""
+    # Engines that rerun themselves until references settle (latexmk,
+    # tectonic); for the others the Renderer drives the passes.
+    manages_passes: bool = False
+    # Engines able to dump a precompiled preamble (``.fmt``) and start from it
+    supports_formats: bool = False
+    # State the engine keeps between builds in a ``build_dir`` work directory,
+    # besides the auxiliary files (Renderer.AUX_SUFFIXES)
+    keep_suffixes: Tuple[str, ...] = ()
+
+    _versions: Dict[str, str] = {}
+    _versions_lock = threading.Lock()
+
+    @abstractmethod
+    def command(self, tex_file: Path) -> List[str]:
+        """Return the command line compiling ``tex_file`` (relative to its dir)."""
+
+    def run(
+        self, tex_file: Path, work_dir: Path, env: dict, fmt: Optional[str] = None
+    ) -> None:
+        """Compile ``tex_file`` in ``work_dir``, optionally starting from the
+        format ``fmt`` (a ``<fmt>.fmt`` file in ``work_dir``)."""
+        cmd = self.command(tex_file)
+        if fmt:
+            cmd = cmd[:1] + [f"-fmt={fmt}"] + cmd[1:]
+        subprocess.check_call(cmd, cwd=str(work_dir), env=env)
+
+    def format_command(self, preamble_file: Path, fmt: str) -> List[str]:
+        """Return the command line dumping ``preamble_file`` into ``<fmt>.fmt``."""
+        raise NotImplementedError(f"{self.name} cannot precompile preambles")
+
+    def pdf_file(self, tex_file: Path) -> Path:
+        return tex_file.with_suffix(".pdf")
+
+    def log_file(self, tex_file: Path) -> Path:
+        return tex_file.with_suffix(".log")
+
+    def parse_error(self, log_file: Path) -> Optional[str]:
+        return extract_error_from_log(log_file)
+
+    def version(self) -> str:
+        """First line of ``<executable> --version``, probed once per process."""
+        with TexEngine._versions_lock:
+            if self.executable in TexEngine._versions:
+                return TexEngine._versions[self.executable]
+        try:
+            proc = subprocess.run(
+                [self.executable, "--version"],
+                capture_output=True,
+                text=True,
+                check=False,
+            )
+            lines = proc.stdout.splitlines()
+            version = lines[0].strip() if lines else "unknown"
+        except (OSError, subprocess.SubprocessError):
+            version = "unavailable"
+        with TexEngine._versions_lock:
+            TexEngine._versions[self.executable] = version
+        return version
+
+    def identity(self) -> str:
+        """Engine name and version, used to key cached build products."""
+        return f"{self.name}:{self.version()}"
+
+
+class LatexEngine(TexEngine):
+    """Engines sharing the classic ``<engine> -interaction=nonstopmode`` CLI."""
+
+    def command(self, tex_file: Path) -> List[str]:
+        return [self.executable, "-interaction=nonstopmode", str(tex_file.name)]
+
+
+class PdfLatexEngine(LatexEngine):
+    name = "pdflatex"
+    executable = "pdflatex"
+    supports_formats = True
+
+    def format_command(self, preamble_file: Path, fmt: str) -> List[str]:
+        return [
+            self.executable,
+            "-ini",
+            "-interaction=nonstopmode",
+            f"-jobname={fmt}",
+            f"&{self.executable}",
+            f"{preamble_file.name}\\dump",
+        ]
+
+
+class LuaLatexEngine(LatexEngine):
+    name = "lualatex"
+    executable = "lualatex"
+
+
+class XeLatexEngine(LatexEngine):
+    name = "xelatex"
+    executable = "xelatex"
+
+
+class LatexmkEngine(TexEngine):
+    name = "latexmk"
+    executable = "latexmk"
+    manages_passes = True
+    # Dependency database and file list: what makes reruns incremental
+    keep_suffixes = (".fdb_latexmk", ".fls")
+
+    def command(self, tex_file: Path) -> List[str]:
+        return [
+            self.executable,
+            "-pdf",
+            "-interaction=nonstopmode",
+            str(tex_file.name),
+        ]
+
+
+class TectonicEngine(TexEngine):
+    name = "tectonic"
+    executable = "tectonic"
+    manages_passes = True
+
+    def command(self, tex_file: Path) -> List[str]:
+        return [
+            self.executable,
+            "--keep-intermediates",
+            "--keep-logs",
+            str(tex_file.name),
+        ]
+
+
+class FakeEngine(TexEngine):
+    """In-process engine for tests: no TeX installation required.
+
+    It writes a one-page PDF and a log. A document containing
+    ``\\FakeError{message}`` fails with ``! message`` in the log.
+    """
+
+    name = "fake"
+    executable = "fake-tex"
+
+    def command(self, tex_file: Path) -> List[str]:
+        return [self.executable, str(tex_file.name)]
+
+    def run(
+        self, tex_file: Path, work_dir: Path, env: dict, fmt: Optional[str] = None
+    ) -> None:
+        tex_path = work_dir / tex_file.name
+        tex_code = tex_path.read_text(encoding="utf-8")
+        log_file = self.log_file(tex_path)
+        error = re.search(r"\\FakeError\{([^}]*)\}", tex_code)
+        if error:
+            log_file.write_text(f"! {error.group(1)}\n", encoding="utf-8")
+            raise subprocess.CalledProcessError(1, self.command(tex_file))
+        log_file.write_text("Output written.\n", encoding="utf-8")
+        self.pdf_file(tex_path).write_bytes(_minimal_pdf())
+
+    def version(self) -> str:
+        return "1"
+
+
+def _minimal_pdf() -> bytes:
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] >>",
+    ]
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\n" % (len(objects) + 1)
+    out += b"startxref\n%d\n%%%%EOF\n" % xref
+    return bytes(out)
+
+
+ENGINES: Dict[str, Type[TexEngine]] = {
+    engine.name: engine
+    for engine in (
+        PdfLatexEngine,
+        LuaLatexEngine,
+        XeLatexEngine,
+        LatexmkEngine,
+        TectonicEngine,
+        FakeEngine,
+    )
+}
+
+
+def register_engine(engine: Type[TexEngine]) -> Type[TexEngine]:
+    """Make a custom engine selectable by name; usable as a class decorator."""
+    ENGINES[engine.name] = engine
+    return engine
+
+
+def get_engine(name: "str | TexEngine | None" = None) -> TexEngine:
+    """Return the engine called ``name``, defaulting to ``[latex] engine``."""
+    if isinstance(name, TexEngine):
+        return name
+    if not name:
+        name = config.get("latex", "engine", fallback=DEFAULT_ENGINE) or DEFAULT_ENGINE
+    try:
+        return ENGINES[name]()
+    except KeyError:
+        raise ConfigError(
+            f"Unknown TeX engine (available: {', '.join(sorted(ENGINES))})",
+            config_item=name,
+        ) from None
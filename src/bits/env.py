@@ -1,13 +1,18 @@
 # pylint: disable=too-few-public-methods
 from __future__ import annotations
 
+import hashlib
 import importlib.util
+import threading
 import warnings
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, List, Set
+from typing import Dict, List, Set, Tuple
 
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemLoader, Template
+from jinja2.bccache import Bucket, FileSystemBytecodeCache
 
+from .cache import BytecodeCache
 from .config import config
 
 DEFAULT_JINJA_SYNTAX: Dict[str, object] = {
@@ -30,10 +35,22 @@ JINJA_SYNTAX_BOOLEAN_OPTIONS: Set[str] = {
     "autoescape",
 }
 
+DEFAULT_TEMPLATE_CACHE_SIZE = 4096
+
 
 class EnvironmentFactory:
     _env_cache: Dict[str, Environment] = {}
     _plugins_enabled: bool = True
+    # (environment key, source sha256) -> compiled template, least recently
+    # used first; shared by every bit compiling the same source
+    _template_cache: "OrderedDict[Tuple[str, str], Template]" = OrderedDict()
+    _template_lock = threading.Lock()
+    # templates folder -> environment key, valid while the config generation
+    # and the plugins switch are those in _keys_state
+    _keys: Dict[Path | None, str] = {}
+    _keys_state: Tuple[int, bool] | None = None
+    # Guards _keys and environment creation (registries may load on threads)
+    _env_lock = threading.RLock()
 
     @classmethod
     def enable_plugins(cls, enabled: bool) -> None:
@@ -92,6 +109,25 @@ class EnvironmentFactory:
     def _get_macro_files_list(cls) -> List[Path]:
         return cls._get_path_list("macro_files")
 
+    @classmethod
+    def plugin_files(cls) -> List[Path]:
+        """Plugin, filter and macro files loaded into every environment."""
+        if not cls._plugins_enabled:
+            return []
+        return [
+            *cls._get_plugins_list(),
+            *cls._get_filter_files_list(),
+            *cls._get_macro_files_list(),
+        ]
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        with cls._env_lock:
+            cls._env_cache.clear()
+            cls._keys.clear()
+        with cls._template_lock:
+            cls._template_cache.clear()
+
     @classmethod
     def _get_syntax_options(cls) -> Dict[str, object]:
         syntax = dict(DEFAULT_JINJA_SYNTAX)
@@ -216,7 +252,7 @@ class EnvironmentFactory:
                 warnings.warn(f"Failed to load macros from {path}: {err}")
 
     @classmethod
-    def get(cls, templates_folder: Path | None = None) -> Environment:
+    def _env_key(cls, templates_folder: Path | None = None) -> str:
         # Build a cache key that incorporates templates folder and plugin settings
         if templates_folder is None:
             base_key = "string"
@@ -251,8 +287,35 @@ class EnvironmentFactory:
             plugin_key = f"plugins:{int(cls._plugins_enabled)}"
             extras_key = ""
 
-        env_key = base_key + "|" + plugin_key + "|" + extras_key + "|" + syntax_key
+        return base_key + "|" + plugin_key + "|" + extras_key + "|" + syntax_key
+
+    @classmethod
+    def _cached_env_key(cls, templates_folder: Path | None) -> str:
+        state = (config.generation, cls._plugins_enabled)
+        with cls._env_lock:
+            if state != cls._keys_state:
+                cls._keys = {}
+                cls._keys_state = state
+            key = cls._keys.get(templates_folder)
+            if key is None:
+                key = cls._keys[templates_folder] = cls._env_key(templates_folder)
+            return key
+
+    @classmethod
+    def get(cls, templates_folder: Path | None = None) -> Environment:
+        env_key = cls._cached_env_key(templates_folder)
+        env = cls._env_cache.get(env_key)
+        if env is None:
+            env = cls._get(env_key, templates_folder)
+        return env
 
+    @classmethod
+    def _get(cls, env_key: str, templates_folder: Path | None) -> Environment:
+        with cls._env_lock:
+            return cls._build(env_key, templates_folder)
+
+    @classmethod
+    def _build(cls, env_key: str, templates_folder: Path | None) -> Environment:
         if env_key in cls._env_cache:
             return cls._env_cache[env_key]
 
@@ -263,7 +326,8 @@ class EnvironmentFactory:
 
         env = Environment(
             loader=loader,
-            **syntax_options,
+            bytecode_cache=cls._bytecode_cache(env_key),
+            **cls._get_syntax_options(),
         )
 
         # Load user plugins last; allow overrides with warning emitted by plugin if desired
@@ -273,3 +337,64 @@ class EnvironmentFactory:
 
         cls._env_cache[env_key] = env
         return env
+
+    @staticmethod
+    def _bytecode_cache(env_key: str) -> FileSystemBytecodeCache | None:
+        """On-disk bytecode cache for one environment, under ``[jinja] cache_dir``
+        (default ``<[cache] dir>/jinja``).
+
+        Jinja keys loader templates by name only, so every environment (syntax,
+        plugins, templates folder) gets its own directory.
+        """
+        bytecode_cache = BytecodeCache.from_config()
+        if bytecode_cache is None:
+            return None
+        digest = hashlib.sha256(env_key.encode("utf-8")).hexdigest()[:16]
+        directory = bytecode_cache.directory / digest
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+        except OSError as err:
+            warnings.warn(f"Jinja bytecode cache disabled: {err}")
+            return None
+        return FileSystemBytecodeCache(str(directory))
+
+    @staticmethod
+    def _compile(env: Environment, source: str, digest: str) -> Template:
+        """``env.from_string`` going through the environment's bytecode cache,
+        keyed by the source hash."""
+        bcc = env.bytecode_cache
+        if bcc is None:
+            return env.from_string(source)
+        bucket = Bucket(env, f"string-{digest}", digest)
+        try:
+            bcc.load_bytecode(bucket)
+        except OSError:
+            bucket.reset()
+        if bucket.code is None:
+            bucket.code = env.compile(source)
+            try:
+                bcc.dump_bytecode(bucket)
+            except OSError:
+                pass
+        return env.template_class.from_code(env, bucket.code, env.make_globals(None))
+
+    @classmethod
+    def from_string(cls, source: str, templates_folder: Path | None = None) -> Template:
+        """Compile ``source`` in the matching environment, reusing the template
+        already compiled for identical source and environment settings."""
+        env_key = cls._cached_env_key(templates_folder)
+        key = (env_key, hashlib.sha256(source.encode("utf-8")).hexdigest())
+        with cls._template_lock:
+            template = cls._template_cache.get(key)
+            if template is not None:
+                cls._template_cache.move_to_end(key)
+                return template
+        template = cls._compile(cls._get(env_key, templates_folder), source, key[1])
+        with cls._template_lock:
+            cls._template_cache[key] = template
+            limit = config.getint(
+                "jinja", "template_cache_size", fallback=DEFAULT_TEMPLATE_CACHE_SIZE
+            )
+            while len(cls._template_cache) > max(limit, 0):
+                cls._template_cache.popitem(last=False)
+        return template
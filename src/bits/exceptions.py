@@ -222,6 +222,17 @@ class BuildError(BitsError):
         super().__init__(message)
 
 
+class BuildFailuresError(BuildError):
+    """Raised when several targets fail to build; each failure is collected."""
+
+    def __init__(self, message="Some targets failed to build", failures=None):
+        self.failures = list(failures or [])
+        if self.failures:
+            details = "\n".join(f"- {name}: {err}" for name, err in self.failures)
+            message = f"{message} ({len(self.failures)}):\n{details}"
+        super().__init__(message)
+
+
 class BuildDependencyError(BuildError):
     """Raised when a build dependency cannot be satisfied."""
 
@@ -1,5 +1,4 @@
 import hashlib
-import os
 import shutil
 import tempfile
 from contextlib import contextmanager
@@ -41,13 +40,45 @@ def create_id_from_string(string: str) -> str:
     return hashlib.md5(bytes(string, "utf-8")).hexdigest()
 
 
+def fingerprint(value) -> str:
+    """Stable content hash of plain data (dicts, lists, scalars).
+
+    Objects exposing a ``fingerprint()`` method (bits, blocks, targets) are
+    hashed through it; anything else falls back to ``repr``.
+    """
+    return hashlib.sha256(_fingerprint_token(value).encode("utf-8")).hexdigest()
+
+
+def _fingerprint_token(value) -> str:
+    method = getattr(value, "fingerprint", None)
+    if callable(method) and not isinstance(value, type):
+        return f"<{type(value).__name__}:{method()}>"
+    if isinstance(value, dict):
+        items = sorted(
+            f"{_fingerprint_token(k)}:{_fingerprint_token(v)}" for k, v in value.items()
+        )
+        return "{" + ",".join(items) + "}"
+    if isinstance(value, (list, tuple)):
+        return "[" + ",".join(_fingerprint_token(v) for v in value) + "]"
+    if isinstance(value, (set, frozenset)):
+        return "{" + ",".join(sorted(_fingerprint_token(v) for v in value)) + "}"
+    return repr(value)
+
+
 @contextmanager
-def tmpdir():
-    cwd = os.getcwd()
-    tmp_dir = tempfile.mkdtemp()
-    os.chdir(tmp_dir)
+def tmpdir(
+    dir: Path | str | None = None, prefix: str | None = None
+):  # pylint: disable=redefined-builtin
+    """Create a temporary directory and remove it on exit.
+
+    The process working directory is left untouched: callers get the path and
+    must pass it explicitly (e.g. as ``cwd`` to a subprocess), which keeps this
+    safe to use from several threads at once.
+    """
+    if dir is not None:
+        Path(dir).mkdir(parents=True, exist_ok=True)
+    tmp_dir = Path(tempfile.mkdtemp(dir=dir, prefix=prefix))
     try:
         yield tmp_dir
     finally:
-        os.chdir(cwd)
-        shutil.rmtree(tmp_dir)
+        shutil.rmtree(tmp_dir, ignore_errors=True)
@@ -8,6 +8,8 @@ class TargetOutputModel(BaseModel):  # pylint: disable=too-few-public-methods
     suffix: str | None = None
     context: dict = {}
     default: bool = False
+    # TeX engine for this output; falls back to the target engine
+    engine: str | None = None
 
 
 class TargetModel(BaseModel):  # pylint: disable=too-few-public-methods
@@ -32,6 +34,9 @@ class TargetModel(BaseModel):  # pylint: disable=too-few-public-methods
     # Optional rendering variants: each output shares the resolved context/queries
     # but may use a different template, dest, suffix, or context overlay.
     outputs: list[TargetOutputModel] = []
+    # TeX engine (pdflatex, lualatex, xelatex, latexmk, tectonic, ...);
+    # defaults to [latex] engine in .bitsrc
+    engine: str | None = None
 
     @validator("outputs", always=True)
     @classmethod
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import io
+import multiprocessing
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from ..config import config
+from ..exceptions import RegistryLoadError
+from ..helpers import normalize_path
+from ..models import RegistryDataModel
+from .registry_factory import RegistryFactory
+
+
+def import_jobs() -> int:
+    """Threads loading independent imports (``[registry] import_jobs``)."""
+    return max(config.getint("registry", "import_jobs", fallback=1), 1)
+
+
+def parse_jobs() -> int:
+    """Processes parsing imported files (``[registry] parse_jobs``, 0 = one
+    per CPU)."""
+    jobs = config.getint("registry", "parse_jobs", fallback=1)
+    return jobs if jobs > 0 else os.cpu_count() or 1
+
+
+def _config_state() -> str:
+    state = io.StringIO()
+    config.write(state)
+    return state.getvalue()
+
+
+def _init_worker(state: str) -> None:
+    # Workers start from the config files: apply the parent's values (e.g.
+    # [variables] set on the command line or by tests)
+    config.read_string(state)
+
+
+class ParsePool:
+    """Parses registry files, on worker processes when several are pending.
+
+    The process pool starts on first use and is shut down on exit. When it
+    cannot run (no process support, broken worker), files are parsed here.
+    """
+
+    def __init__(self, parse: Callable[[Path], RegistryDataModel], jobs: int = 1):
+        self.parse = parse
+        self.jobs = jobs
+        self._executor: ProcessPoolExecutor | None = None
+
+    def __enter__(self) -> ParsePool:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def map(self, files: List[Path]) -> List[RegistryDataModel]:
+        if self.jobs > 1 and len(files) > 1 and self._start():
+            try:
+                futures = [self._executor.submit(self.parse, file) for file in files]
+                return [
+                    self._parsed(file, future.result)
+                    for file, future in zip(files, futures)
+                ]
+            except (BrokenProcessPool, OSError):
+                self.jobs = 1
+        return [
+            self._parsed(file, lambda file=file: self.parse(file)) for file in files
+        ]
+
+    @staticmethod
+    def _parsed(
+        file: Path, parse: Callable[[], RegistryDataModel]
+    ) -> RegistryDataModel:
+        # Name the import that failed, as loading it on its own would
+        try:
+            return parse()
+        except BrokenProcessPool:
+            raise
+        except Exception as err:
+            raise RegistryLoadError(path=file) from err
+
+    def _start(self) -> bool:
+        if self._executor is not None:
+            return True
+        try:
+            pickle.dumps(self.parse)
+            # Never fork: watch mode runs observer and queue threads whose
+            # locks a forked child could inherit held. Spawned workers get
+            # the config through _init_worker.
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.jobs,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(_config_state(),),
+            )
+        except (pickle.PicklingError, AttributeError, TypeError, OSError):
+            self.jobs = 1
+            return False
+        return True
+
+
+class ImportGraph:
+    """Registries reachable from a registry file through ``import`` entries.
+
+    Nodes are keyed like ``RegistryFactory`` entries: the normalized import
+    path, which may be a directory holding an index file. Discovery reuses the
+    models of cached registries that are still fresh and parses the others
+    once; ``load`` then loads every node once, imports before importers, so
+    that a registry shared by several importers (a diamond) is a cache hit
+    for all but the first.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.edges: Dict[Path, List[Path]] = {}
+        # Models parsed during discovery, handed over to the loads
+        self.models: Dict[Path, RegistryDataModel] = {}
+
+    @classmethod
+    def discover(
+        cls,
+        root: Path,
+        model: RegistryDataModel,
+        parse: Callable[[Path], RegistryDataModel],
+        jobs: int | None = None,
+    ) -> ImportGraph:
+        """Walk the imports of ``root`` (whose content is ``model``). Files
+        not cached are parsed with ``parse``, on up to ``jobs`` processes
+        (default ``[registry] parse_jobs``); ``parse`` must then be picklable.
+        """
+        graph = cls(root)
+        seen = {root}
+        # Breadth-first: the files of one wave are parsed together
+        wave = [(root, root, model)]
+        with ParsePool(parse, parse_jobs() if jobs is None else jobs) as pool:
+            while wave:
+                next_wave = []
+                to_parse = []
+                for node, file, node_model in wave:
+                    graph.edges[node] = [
+                        normalize_path(entry["registry"], relative_to=file)
+                        for entry in node_model.imports
+                    ]
+                    for dep in graph.edges[node]:
+                        if dep in seen:
+                            continue
+                        seen.add(dep)
+                        cached = RegistryFactory.get_fresh(dep, as_dep=True)
+                        if cached is not None:
+                            dep_file = cached._path  # pylint: disable=protected-access
+                            next_wave.append((dep, dep_file, cached.registryfile_model))
+                        else:
+                            to_parse.append((dep, RegistryFactory.resolve_file(dep)))
+                models = pool.map([file for _, file in to_parse])
+                for (dep, file), dep_model in zip(to_parse, models):
+                    graph.models[dep] = dep_model
+                    next_wave.append((dep, file, dep_model))
+                wave = next_wave
+        return graph
+
+    def levels(self) -> List[List[Path]]:
+        """Imported nodes grouped by depth, leaves first; nodes of one level
+        do not import each other. The root is not included."""
+        depth: Dict[Path, int] = {}
+        visiting: List[Path] = []
+
+        def visit(node: Path) -> int:
+            if node in depth:
+                return depth[node]
+            if node in visiting:
+                cycle = visiting[visiting.index(node) :] + [node]
+                raise RegistryLoadError(
+                    message="Circular registry import",
+                    path=" -> ".join(str(p) for p in cycle),
+                )
+            visiting.append(node)
+            depth[node] = 1 + max((visit(dep) for dep in self.edges[node]), default=-1)
+            visiting.pop()
+            return depth[node]
+
+        visit(self.root)
+        levels: List[List[Path]] = [[] for _ in range(depth[self.root])]
+        for node, level in depth.items():
+            if node != self.root:
+                levels[level].append(node)
+        return [sorted(level) for level in levels]
+
+    def load(self, jobs: int = 1) -> None:
+        """Load every imported registry once, levels in order; the nodes of a
+        level run on up to ``jobs`` threads."""
+        for level in self.levels():
+            if jobs > 1 and len(level) > 1:
+                with ThreadPoolExecutor(max_workers=min(jobs, len(level))) as pool:
+                    list(pool.map(self._load_node, level))
+            else:
+                for node in level:
+                    self._load_node(node)
+
+    def _load_node(self, node: Path) -> None:
+        kwargs = {"model": self.models[node]} if node in self.models else {}
+        RegistryFactory.get(node, as_dep=True, **kwargs)
@@ -1,13 +1,20 @@
 from __future__ import annotations
 
+import hashlib
+import os
+import itertools
 import threading
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Callable, List
+from typing import Callable, Iterable, List
 
 from ..bit import Bit
 from ..collections import Collection
+from ..config import config
 from ..constant import Constant
+from ..exceptions import BuildFailuresError
+from ..helpers import normalize_path
+from ..renderer import Renderer
 from ..target import Target
 
 
@@ -26,6 +33,19 @@ class Registry(ABC):
 
         self._load_lock = threading.Lock()
 
+        # What the last successful load saw: its mode and (mtime, size) of the
+        # files it read, plus the registry content hash
+        self._loaded_as_dep: bool | None = None
+        self._file_state: dict[str, tuple[int, int] | None] = {}
+        self._content_hash: str | None = None
+        self._checked_generation: int | None = None
+        self._config_generation: int | None = None
+        # Bumped on every load; dependents remember the stamps they built on.
+        # Imported and queried registries both reach _deps (add_dep), so a
+        # reload of either makes this registry stale.
+        self._load_stamp: int = 0
+        self._dep_stamps: list[tuple[Registry, int]] = []
+
     @property
     def deps(self) -> List[Registry]:
         return self._deps
@@ -65,21 +85,164 @@ class Registry(ABC):
         unique_strategy: str | None = None,
         output_name: str | None = None,
         all_outputs: bool = False,
+        jobs: int | None = 1,
+        only_dirty: bool = False,
+        changed_paths: Iterable[Path | str] | None = None,
     ) -> None:
+        """Render all targets, compiling up to ``jobs`` PDFs concurrently
+        (``None`` means one per CPU). Errors are collected per target and
+        raised together once every target has been attempted.
+
+        ``only_dirty`` and ``changed_paths`` restrict the build to targets
+        whose inputs changed since their last successful render, and/or to
+        targets depending on one of ``changed_paths``."""
+        changed = (
+            None
+            if changed_paths is None
+            else {str(normalize_path(p)) for p in changed_paths}
+        )
+        if changed and only_dirty:
+            # Edits to registries this one was loaded from are already in the
+            # targets' fingerprints (dirty); matching them would select every
+            # target listing its own registry file.
+            changed -= self._registry_files()
         with self._load_lock:
+            # TeX is rendered here, on the calling thread; only the LaTeX
+            # compiles are spread over the worker threads.
+            failures: list[tuple[str, Exception]] = []
+            compile_jobs: list[dict] = []
+            attempted: list[Target] = []
             for target in self._targets:
-                target.render(
-                    output_tex=output_tex,
-                    pdf=pdf,
-                    tex=tex,
-                    both=both,
-                    build_dir=build_dir,
-                    intermediates_dir=intermediates_dir,
-                    keep_intermediates=keep_intermediates,
-                    unique_strategy=unique_strategy,
-                    output_name=output_name,
-                    all_outputs=all_outputs,
-                )
+                if not self._should_render(target, only_dirty, changed):
+                    continue
+                attempted.append(target)
+                try:
+                    compile_jobs.extend(
+                        target.prepare(
+                            output_tex,
+                            pdf=pdf,
+                            tex=tex,
+                            both=both,
+                            unique_strategy=unique_strategy,
+                            output_name=output_name,
+                            all_outputs=all_outputs,
+                        )
+                    )
+                except Exception as err:  # pylint: disable=broad-except
+                    failures.append((target.name or str(target.id), err))
+
+            for job, err in Renderer.render_many(
+                compile_jobs,
+                max_workers=jobs,
+                build_dir=build_dir,
+                intermediates_dir=intermediates_dir,
+                keep_intermediates=keep_intermediates,
+            ):
+                failures.append((job["target"], err))
+
+            failed = {name for name, _ in failures}
+            for target in attempted:
+                if (target.name or str(target.id)) not in failed:
+                    target.dirty = False
+
+        if len(failures) == 1:
+            raise failures[0][1]
+        if failures:
+            raise BuildFailuresError(failures=failures)
+
+    @staticmethod
+    def _should_render(
+        target: Target, only_dirty: bool, changed: set[str] | None
+    ) -> bool:
+        if not only_dirty and changed is None:
+            return True
+        if only_dirty and target.dirty:
+            return True
+        return bool(changed and changed & target.dependency_files())
+
+    def _registry_files(self) -> set[str]:
+        """This registry's file and those of the registries it loaded from."""
+        files: set[str] = set()
+        pending: list[Registry] = [self]
+        while pending:
+            registry = pending.pop()
+            path = str(normalize_path(registry._path))
+            if path in files:
+                continue
+            files.add(path)
+            pending.extend(registry._deps)
+        return files
+
+    def dependency_files(self) -> set[str]:
+        """Files any target of this registry depends on, plus the registry."""
+        files = {str(normalize_path(self._path))}
+        for target in self._targets:
+            files |= target.dependency_files()
+        return files
+
+    def _record_file_state(self, as_dep: bool, generation: int) -> None:
+        files = {str(normalize_path(self._path))}
+        if not as_dep:
+            files |= self.dependency_files()
+        self._file_state = {path: _stat(path) for path in files}
+        self._config_generation = config.generation
+        self._content_hash = _content_hash(self._path)
+        self._loaded_as_dep = as_dep
+        self._checked_generation = generation
+        self._load_stamp = next(_load_stamps)
+        self._dep_stamps = [(dep, dep._load_stamp) for dep in self._deps]
+
+    def _forget_file_state(self) -> None:
+        # Until a load completes, the registry matches no files: a failed
+        # load must not look fresh once its files are reverted
+        self._loaded_as_dep = None
+        self._file_state = {}
+        self._content_hash = None
+        self._checked_generation = None
+        self._dep_stamps = []
+        self._load_stamp = next(_load_stamps)
+
+    def _files_unchanged(self) -> bool:
+        own = str(normalize_path(self._path))
+        for path, state in self._file_state.items():
+            current = _stat(path)
+            if current == state:
+                continue
+            # Touched but identical (e.g. a checkout): keep the load
+            if path == own and current is not None:
+                if _content_hash(self._path) == self._content_hash:
+                    self._file_state[path] = current
+                    continue
+            return False
+        return True
+
+    def is_fresh(self, as_dep: bool = False) -> bool:
+        """Whether the last load (in the same mode) still reflects the files
+        on disk, including imported and queried registries.
+
+        Checks run at most once per ``RegistryFactory.generation``.
+        """
+        from .registry_factory import RegistryFactory
+
+        if self._loaded_as_dep is None or self._loaded_as_dep != as_dep:
+            return False
+        # [variables] and other settings shape the parsed data
+        if self._config_generation != config.generation:
+            return False
+        # A dependency reloaded since: our copies of its elements are stale
+        if any(dep._load_stamp != stamp for dep, stamp in self._dep_stamps):
+            return False
+        generation = RegistryFactory.generation
+        if self._checked_generation == generation:
+            return True
+        # Mark first: import cycles then terminate
+        self._checked_generation = generation
+        fresh = self._files_unchanged() and all(
+            dep.is_fresh(as_dep=bool(dep._loaded_as_dep)) for dep in self._deps
+        )
+        if not fresh:
+            self._checked_generation = None
+        return fresh
 
     def add_dep(self, registry: Registry) -> None:
         if not isinstance(registry, Registry):
@@ -98,3 +261,21 @@ class Registry(ABC):
     @abstractmethod
     def stop(self, recursive=True) -> None:
         pass
+
+
+_load_stamps = itertools.count(1)
+
+
+def _stat(path: Path | str) -> tuple[int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _content_hash(path: Path) -> str | None:
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return None
@@ -1,5 +1,7 @@
 # pylint: disable=import-outside-toplevel
+from __future__ import annotations
 
+import threading
 from pathlib import Path
 from typing import Union
 
@@ -10,42 +12,80 @@ from .registry import Registry
 
 class RegistryFactory:  # pylint: disable=too-few-public-methods
     _cache = {}
+    # One lock per requested path: a registry shared by imports loading on
+    # several threads is built once; other paths load concurrently
+    _locks: dict[Path, threading.RLock] = {}
+    _locks_lock = threading.Lock()
+    # Build-scoped generation: a cached registry is checked for changes at
+    # most once per generation (see Registry.is_fresh)
+    generation: int = 0
+
+    @classmethod
+    def refresh(cls) -> None:
+        """Start a new build: cached registries are re-checked on next use."""
+        cls.generation += 1
 
     @staticmethod
     def get(path: Union[Path, str], **kwargs) -> Registry:
         normalized_path: Path = normalize_path(path)
+        as_dep: bool = kwargs.get("as_dep", False)
+        if not as_dep:
+            RegistryFactory.refresh()
+        with RegistryFactory._path_lock(normalized_path):
+            return RegistryFactory._get(normalized_path, **kwargs)
+
+    @staticmethod
+    def _path_lock(normalized_path: Path) -> threading.RLock:
+        with RegistryFactory._locks_lock:
+            return RegistryFactory._locks.setdefault(normalized_path, threading.RLock())
 
+    @staticmethod
+    def _get(normalized_path: Path, **kwargs) -> Registry:
+        as_dep: bool = kwargs.get("as_dep", False)
         if normalized_path in RegistryFactory._cache:
             registry: Registry = RegistryFactory._cache[normalized_path]
-            # Ensure cache entry is reloaded with potentially new kwargs
-            registry.load(**kwargs)
+            # Reload only when loaded differently or something changed on disk
+            if not registry.is_fresh(as_dep=as_dep):
+                registry.load(**kwargs)
             return registry
 
-        registry_path_to_load = normalized_path
-        if normalized_path.is_dir():
-            index_file = RegistryFactory.search_for_index(normalized_path)
-            if index_file:
-                registry_path_to_load = index_file
-            else:
-                # If it's a directory without an index file, raise error.
-                raise RegistryNotFoundError(
-                    path=normalized_path,
-                    message=f"Directory '{normalized_path}' is not a valid registry. No index file (index.md, index.yaml, index.yml) found.",
-                )
-        elif not normalized_path.is_file():
-            # If it's not a file and not a directory (or doesn't exist)
-            raise RegistryNotFoundError(path=normalized_path)
+        registry_path_to_load = RegistryFactory.resolve_file(normalized_path)
 
         # At this point, registry_path_to_load should be a file (either the original path or an index file)
         from .registryfile import RegistryFile
 
+        # The constructor loads the registry
         registry = RegistryFile(registry_path_to_load, **kwargs)
 
-        registry.load(**kwargs)
         # Cache based on the original normalized path requested
         RegistryFactory._cache[normalized_path] = registry
         return registry
 
+    @staticmethod
+    def get_fresh(path: Union[Path, str], as_dep: bool = False) -> Registry | None:
+        """The cached registry for ``path`` if using it needs no reload."""
+        registry = RegistryFactory._cache.get(normalize_path(path))
+        if registry is not None and registry.is_fresh(as_dep=as_dep):
+            return registry
+        return None
+
+    @staticmethod
+    def resolve_file(normalized_path: Path) -> Path:
+        """The registry file behind ``normalized_path`` (a directory's index)."""
+        if normalized_path.is_dir():
+            index_file = RegistryFactory.search_for_index(normalized_path)
+            if index_file:
+                return index_file
+            # If it's a directory without an index file, raise error.
+            raise RegistryNotFoundError(
+                path=normalized_path,
+                message=f"Directory '{normalized_path}' is not a valid registry. No index file (index.md, index.yaml, index.yml) found.",
+            )
+        if not normalized_path.is_file():
+            # If it's not a file and not a directory (or doesn't exist)
+            raise RegistryNotFoundError(path=normalized_path)
+        return normalized_path
+
     @staticmethod
     def search_for_index(path: Path) -> Union[Path, None]:
         for index_file in ["index.md", "index.yaml", "index.yml"]:
@@ -9,12 +9,15 @@ import jinja2
 
 from ..bit import Bit
 from ..block import Block
+from ..cache import RegistryCache
 from ..collections import Collection
 from ..config import config
 from ..constant import Constant
+from ..dialects import DialectRegistry
+from ..dependencies import collect_target_dependencies
 from ..env import EnvironmentFactory
 from ..exceptions import RegistryLoadError, TemplateContextError, TemplateLoadError
-from ..helpers import normalize_path
+from ..helpers import fingerprint, normalize_path
 from ..models import (
     BitModel,
     BlocksModel,
@@ -28,6 +31,7 @@ from ..models import (
 )
 from ..target import Target
 from ..watcher import Watcher
+from .import_graph import ImportGraph, import_jobs
 from .registry import Registry
 from .registry_factory import RegistryFactory
 from .registryfile_dumpers import RegistryFileDumperFactory
@@ -36,22 +40,48 @@ from .registryfile_parsers import RegistryFileParserFactory
 
 class RegistryFile(Registry):
     # pylint: disable=unused-argument
-    def __init__(self, path: Path, as_dep: bool = False):
+    def __init__(
+        self, path: Path, as_dep: bool = False, model: RegistryDataModel | None = None
+    ):
         super().__init__(path)
         if not self._path.is_file():
             raise IsADirectoryError
         self._watcher: Watcher = Watcher(self._path)
         self._parser = RegistryFileParserFactory.get(self._path)
-        self.load(as_dep=as_dep)
-
-    def load(self, as_dep: bool = False):
+        # Objects from the previous load, keyed by model content hash, so that
+        # a reload keeps unchanged bits (and their compiled templates)
+        self._bit_pool: dict[str, List[Bit]] = {}
+        self._constant_pool: dict[str, List[Constant]] = {}
+        # Registry files reached by queries while resolving the current target
+        self._consulted_registries: set[str] | None = None
+        # Candidates of each distinct blocks/constants query, for one load
+        self._query_cache: dict[str, tuple] = {}
+        self.load(as_dep=as_dep, model=model)
+
+    def load(self, as_dep: bool = False, model: RegistryDataModel | None = None):
+        """(Re)load the registry; ``model`` is its already parsed content."""
+        if not as_dep:
+            # A top-level (re)load is a new build for freshness checks
+            RegistryFactory.refresh()
+        generation = RegistryFactory.generation
         try:
             with self._load_lock:
+                previous_targets = {
+                    self._target_key(target, i): target
+                    for i, target in enumerate(self._targets)
+                }
                 self.clear_registry()
-
-                self.registryfile_model: RegistryDataModel = self._parser.parse(
-                    self._path
-                )
+                self._forget_file_state()
+                # One dialect freshness check per load (build or watch event)
+                DialectRegistry.refresh()
+                self._query_cache = {}
+
+                self.registryfile_model: RegistryDataModel = model or self._parse()
+                if not as_dep and self.registryfile_model.imports:
+                    # Whole import DAG first: shared imports load once
+                    ImportGraph.discover(
+                        self._path, self.registryfile_model, RegistryFile.parse_file
+                    ).load(jobs=import_jobs())
 
                 common_tags: List[str] = self.registryfile_model.tags or []
 
@@ -70,15 +100,55 @@ class RegistryFile(Registry):
                 if not as_dep:
                     self._load_targets(self.registryfile_model.targets, common_tags)
                     self._targets.extend(imported_targets)
+                    self._mark_dirty_targets(previous_targets)
+                    self._watcher.watch_files(self.dependency_files())
+                self._record_file_state(as_dep, generation)
         except Exception as err:
             raise RegistryLoadError(path=self._path) from err
 
+    def _parse(self) -> RegistryDataModel:
+        return RegistryFile.parse_file(self._path, self._parser)
+
+    @staticmethod
+    def parse_file(path: Path, parser=None) -> RegistryDataModel:
+        """Parse the registry file at ``path``, through the registry cache."""
+        parser = parser or RegistryFileParserFactory.get(path)
+        registry_cache = RegistryCache.from_config()
+        if registry_cache is None:
+            return parser.parse(path)
+        key = registry_cache.make_registry_key(path, path.read_bytes())
+        model = registry_cache.load(key)
+        if not isinstance(model, RegistryDataModel):
+            model = parser.parse(path)
+            registry_cache.dump(key, model)
+        return model
+
+    @staticmethod
+    def _pool_key(model, common_tags: List[str], *extra) -> str:
+        return fingerprint([model.dict(), common_tags, *extra])
+
+    @staticmethod
+    def _take_from_pool(pool: dict, key: str):
+        candidates = pool.get(key)
+        return candidates.pop() if candidates else None
+
     def _load_bits(self, bit_models: List[BitModel], common_tags: List[str]):
+        previous_pool, self._bit_pool = self._bit_pool, {}
+        # Compiled templates belong to an environment: never reuse them across
+        # environment (syntax/plugins) changes.
+        env_token = id(EnvironmentFactory.get())
         for bit_model in bit_models:
-            src = bit_model.src
+            key = self._pool_key(bit_model, common_tags, str(self._path), env_token)
             meta: dict = bit_model.dict(exclude={"src"})
-            bit: Bit = Bit(src, source_path=str(self._path), **meta)
-            bit.tags.extend(common_tags)
+            bit: Bit | None = self._take_from_pool(previous_pool, key)
+            if bit is None:
+                bit = Bit(bit_model.src, source_path=str(self._path), **meta)
+                bit.tags.extend(common_tags)
+            else:
+                # Unchanged model: keep the object, reset what loading mutates
+                bit.defaults = copy.deepcopy(meta.get("defaults") or {})
+                bit.presets = copy.deepcopy(meta.get("presets") or [])
+            self._bit_pool.setdefault(key, []).append(bit)
             self._bits.append(bit)
 
         for bit in self._bits:
@@ -136,9 +206,17 @@ class RegistryFile(Registry):
     def _load_constants(
         self, constant_models: List[ConstantModel], common_tags: List[str]
     ):
+        previous_pool, self._constant_pool = self._constant_pool, {}
         for constant_model in constant_models:
-            constant: Constant = Constant.from_model(constant_model)
-            constant.tags.extend(common_tags)
+            key = self._pool_key(constant_model, common_tags)
+            constant: Constant | None = self._take_from_pool(previous_pool, key)
+            if constant is None:
+                constant = Constant.from_model(constant_model)
+                constant.tags.extend(common_tags)
+                constant._source_path = str(  # pylint: disable=protected-access
+                    self._path
+                )
+            self._constant_pool.setdefault(key, []).append(constant)
             self._constants.append(constant)
 
     def _load_targets(self, target_models: List[TargetModel], common_tags: List[str]):
@@ -167,21 +245,58 @@ class RegistryFile(Registry):
                 queries=merged_spec.get("queries") or {},
                 compose=merged_spec.get("compose") or {},
                 outputs=target_model.outputs,
+                engine=merged_spec.get("engine"),
             )
-            target: Target = self._resolve_target(final_tm)
+            self._consulted_registries = {str(self._path)}
+            try:
+                target: Target = self._resolve_target(final_tm)
+                target.dependencies = collect_target_dependencies(
+                    target, self._consulted_registries
+                )
+            finally:
+                self._consulted_registries = None
             target.tags.extend(common_tags)
             self._targets.append(target)
 
+    @staticmethod
+    def _target_key(target: Target, index: int) -> str:
+        return target.name if target.name is not None else f"#{index}"
+
+    def _mark_dirty_targets(self, previous_targets: dict[str, Target]) -> None:
+        """Flag targets whose resolved inputs changed since the previous load.
+
+        A target stays dirty until it renders successfully, so a target that
+        failed last time is retried even if its inputs did not change.
+        """
+        # pylint: disable=protected-access
+        for i, target in enumerate(self._targets):
+            target._fingerprint = target.fingerprint()
+            previous = previous_targets.get(self._target_key(target, i))
+            target.dirty = (
+                previous is None
+                or previous.dirty
+                or previous._fingerprint != target._fingerprint
+            )
+
     def _import_registry_data(self, imports):
         imported_bits: List[Bit] = []
         imported_constants: List[Constant] = []
         imported_targets: List[Target] = []
 
+        # A registry reached through several imports (a diamond) is one
+        # loaded object: take each of its elements once
+        seen: set[str] = set()
+
+        def new_elements(elements):
+            fresh = [e for e in elements if str(e.id) not in seen]
+            seen.update(str(e.id) for e in fresh)
+            return fresh
+
         for import_entry in imports:
             imported_registry = self._resolve_registry(import_entry["registry"])
-            imported_bits.extend(imported_registry.bits)
-            imported_constants.extend(imported_registry.constants)
-            imported_targets.extend(imported_registry.targets)
+            imported_bits.extend(new_elements(imported_registry.bits))
+            imported_constants.extend(new_elements(imported_registry.constants))
+            imported_targets.extend(new_elements(imported_registry.targets))
 
         return imported_bits, imported_constants, imported_targets
 
@@ -192,6 +307,10 @@ class RegistryFile(Registry):
         registry_path: Path = self._resolve_path(path)
         registry: Registry = RegistryFactory.get(registry_path, as_dep=True)
         self.add_dep(registry)
+        if self._consulted_registries is not None:
+            self._consulted_registries.add(
+                str(registry._path)  # pylint: disable=protected-access
+            )
         return registry
 
     def _resolve_template(self, path: str) -> jinja2.Template:
@@ -216,7 +335,7 @@ class RegistryFile(Registry):
     ) -> dict:
         """Resolve a TargetModel with optional extends into a merged spec dict.
 
-        Merges: template, dest, context, queries, compose. Lists replace; maps deep-merge.
+        Merges: template, dest, engine, context, queries, compose. Lists replace; maps deep-merge.
         Multi-extends: apply bases left->right; last wins. Finally apply derived fields, then
         apply derived 'overrides' (path-based) onto queries/context/compose.
         """
@@ -413,6 +532,8 @@ class RegistryFile(Registry):
             merged["template"] = model.template
         if model.dest is not None:
             merged["dest"] = model.dest
+        if model.engine is not None:
+            merged["engine"] = model.engine
 
         # Merge policy
         m = getattr(model, "merge", None) or {}
@@ -569,15 +690,15 @@ class RegistryFile(Registry):
         )
 
         # Resolve candidate bits using legacy query or new where
-        if data.query:
-            bits: Collection[Bit] = registry.bits.query(**data.query.dict())
-        elif getattr(data, "where", None):
-            bits = self._filter_bits_with_where(registry.bits, data.where)  # type: ignore[arg-type]
-        else:
-            bits = registry.bits
+        def candidates() -> Collection[Bit]:
+            if data.query:
+                return registry.bits.query(**data.query.dict())
+            if getattr(data, "where", None):
+                return self._filter_bits_with_where(registry.bits, data.where)  # type: ignore[arg-type]
+            return registry.bits
 
         # Apply select if provided
-        seq: list[Bit] = list(bits)
+        seq: list[Bit] = self._cached_candidates("bits", registry, data, candidates)
         if getattr(data, "select", None):
             seq = self._apply_select(seq, data.select)  # type: ignore[arg-type]
 
@@ -621,19 +742,43 @@ class RegistryFile(Registry):
         )
 
         # Resolve candidate constants using legacy query or new where
-        if data.query:
-            const_coll = registry.constants.query(**data.query.dict())
-        elif getattr(data, "where", None):
-            const_coll = self._filter_constants_with_where(registry.constants, data.where)  # type: ignore[arg-type]
-        else:
-            const_coll = registry.constants
-
-        seq: list[Constant] = list(const_coll)
+        def candidates() -> Collection[Constant]:
+            if data.query:
+                return registry.constants.query(**data.query.dict())
+            if getattr(data, "where", None):
+                return self._filter_constants_with_where(registry.constants, data.where)  # type: ignore[arg-type]
+            return registry.constants
+
+        seq: list[Constant] = self._cached_candidates(
+            "constants", registry, data, candidates
+        )
         if getattr(data, "select", None):
             seq = self._apply_select(seq, data.select)  # type: ignore[arg-type]
 
         return seq
 
+    def _cached_candidates(
+        self, kind: str, registry: Registry, data, candidates: Callable
+    ) -> list:
+        """Return a fresh list of the candidates matching ``data``'s query.
+
+        Queries are keyed by registry, kind and their normalised ``query`` or
+        ``where`` fields, so targets, outputs and presets sharing a pool filter
+        it once per load; ``select`` is applied by callers to the copy.
+        """
+        where = getattr(data, "where", None)
+        spec = {
+            "query": data.query.dict() if data.query else None,
+            "where": where.dict() if where and not data.query else None,
+        }
+        key = fingerprint(
+            [kind, str(registry._path), spec]  # pylint: disable=protected-access
+        )
+        cached = self._query_cache.get(key)
+        if cached is None:
+            cached = self._query_cache[key] = tuple(candidates())
+        return list(cached)
+
     @staticmethod
     def _select_preset(bit: Bit, selector: str | int | None):
         if selector is None:
@@ -1307,7 +1452,9 @@ class RegistryFile(Registry):
         # If dest is a directory, keep as directory; Target will name <name>.pdf
         # This preserves stable, readable naming and aligns with tests.
 
-        target: Target = Target(template, context, dest, name=name, tags=tags)
+        target: Target = Target(
+            template, context, dest, name=name, tags=tags, engine=data.engine
+        )
 
         # Resolve and attach output specs (each shares the already-resolved context)
         resolved_outputs = []
@@ -1325,6 +1472,7 @@ class RegistryFile(Registry):
                     "suffix": out_model.suffix,
                     "context": out_context,
                     "default": out_model.default,
+                    "engine": out_model.engine or data.engine,
                 }
             )
         target._outputs = resolved_outputs  # pylint: disable=protected-access
@@ -1,16 +1,38 @@
 import hashlib
 import os
+import re
 import shutil
 import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 
+from .cache import FormatCache, PdfCache
+from .config import config
+from .engines import TexEngine, extract_error_from_log, get_engine
 from .exceptions import LatexRenderError
 from .helpers import tmpdir, write
 
+DEFAULT_MAX_PASSES = 3
+
+# Auxiliary files kept per target under build_dir between builds. Their
+# combined hash decides whether another LaTeX pass is needed.
+AUX_SUFFIXES = (".aux", ".toc", ".lof", ".lot", ".out", ".nav", ".snm")
+# Log messages of LaTeX and common packages asking for another pass
+RERUN_PATTERN = re.compile(
+    r"Rerun to get|Label\(s\) may have changed|Please rerun|Rerun LaTeX"
+)
+
 
 class Renderer:
     _cache: Dict[str, str] = {}
+    _work_dir_locks: Dict[Path, threading.Lock] = {}
+    _format_locks: Dict[str, threading.Lock] = {}
+    # Keys of preambles that could not be dumped into a working format
+    _failed_formats: Set[str] = set()
+    _lock = threading.Lock()
 
     @staticmethod
     def _generate_hash(tex_code: str) -> str:
@@ -25,13 +47,43 @@ class Renderer:
         build_dir: Optional[Path] = None,
         intermediates_dir: Optional[Path] = None,
         keep_intermediates: str = "none",
+        max_passes: Optional[int] = None,
+        engine: "str | TexEngine | None" = None,
     ) -> None:
+        """Compile ``tex_code`` to ``dest`` (or write the ``.tex`` only).
+
+        ``engine`` selects the TeX backend (default: ``[latex] engine``).
+        LaTeX is rerun while the auxiliary files keep changing, up to
+        ``max_passes`` (default: ``[latex] max_passes``), unless the engine
+        manages passes itself. Under ``build_dir`` the auxiliary files survive
+        between builds, so warm rebuilds usually converge after a single pass.
+
+        With ``[latex] precompile_preamble`` enabled, the preamble is dumped
+        once into a cached format file and later compiles start from it.
+        """
+        tex_engine = get_engine(engine)
+        max_passes = (
+            1 if tex_engine.manages_passes else Renderer._max_passes(max_passes)
+        )
         current_hash = Renderer._generate_hash(tex_code)
-        if dest in Renderer._cache and Renderer._cache[dest] == current_hash:
+        if Renderer._is_unchanged(tex_code, dest):
             print(f"No changes detected for {dest}, skipping rendering Latex.")
             return
 
-        # Prepare working directory
+        # Persistent cache: reuse a PDF compiled from identical TeX by an earlier
+        # build. Skipped when intermediates are requested, since only an actual
+        # compile produces them.
+        pdf_cache = None if output_tex else PdfCache.from_config()
+        cache_key = None
+        if pdf_cache is not None:
+            cache_key = PdfCache.make_key(
+                tex_code, f"{tex_engine.identity()}|passes={max_passes}"
+            )
+            if keep_intermediates != "all" and pdf_cache.fetch(cache_key, dest):
+                print(f"Reusing cached PDF for {dest}, skipping rendering Latex.")
+                Renderer._remember(dest, current_hash)
+                return
+
         def _copy_intermediates(src_dir: Path, dest_root: Path):
             if dest_root is None:
                 return
@@ -44,22 +96,9 @@ class Renderer:
                 except Exception:
                     pass
 
-        if build_dir is not None:
-            work_dir = Path(build_dir) / dest.stem
-            # fresh per render attempt
-            if work_dir.exists():
-                shutil.rmtree(work_dir, ignore_errors=True)
-            work_dir.mkdir(parents=True, exist_ok=True)
-            cwd_ctx = None
-        else:
-            cwd_ctx = tmpdir()
-
-        try:
-            if cwd_ctx is not None:
-                wd_path = Path(cwd_ctx.__enter__())
-            else:
-                wd_path = work_dir
-
+        with Renderer._work_dir(
+            dest, build_dir, keep=AUX_SUFFIXES + tex_engine.keep_suffixes
+        ) as wd_path:
             tex_file = wd_path / f"{dest.stem}.tex"
             write(tex_code, tex_file)
 
@@ -70,29 +109,47 @@ class Renderer:
                 # Do NOT update cache on tex-only output; we may still need to build PDF next.
                 return
 
-            log_file = tex_file.with_suffix(".log")
+            log_file = tex_engine.log_file(tex_file)
             try:
                 # Ensure TeX can write cache files in the working directory on first run
                 env = os.environ.copy()
                 env.setdefault("TEXMFVAR", str(wd_path))
-                subprocess.check_call(
-                    [
-                        "pdflatex",
-                        "-interaction=nonstopmode",
-                        str(tex_file.name),
-                    ],
-                    cwd=str(wd_path),
-                    env=env,
-                )
-                pdf_file = wd_path / f"{dest.stem}.pdf"
+                fmt = None
+                split = Renderer._split_preamble(tex_code, tex_engine)
+                if split is not None:
+                    fmt = Renderer._precompiled_format(
+                        split[0], tex_engine, wd_path, env
+                    )
+                if fmt is None:
+                    Renderer._run_passes(tex_engine, tex_file, wd_path, env, max_passes)
+                else:
+                    write(split[1], tex_file)
+                    try:
+                        Renderer._run_passes(
+                            tex_engine, tex_file, wd_path, env, max_passes, fmt
+                        )
+                    except subprocess.CalledProcessError:
+                        # The format may not suit this document (packages that
+                        # cannot be dumped): retry once with the full preamble.
+                        write(tex_code, tex_file)
+                        for aux_file in Renderer._aux_files(wd_path):
+                            aux_file.unlink(missing_ok=True)
+                        Renderer._run_passes(
+                            tex_engine, tex_file, wd_path, env, max_passes
+                        )
+                        with Renderer._lock:
+                            Renderer._failed_formats.add(fmt)
+                pdf_file = tex_engine.pdf_file(tex_file)
                 dest.parent.mkdir(parents=True, exist_ok=True)
                 shutil.copy(str(pdf_file), str(dest))
-                Renderer._cache[dest] = current_hash
+                Renderer._remember(dest, current_hash)
+                if pdf_cache is not None and cache_key is not None:
+                    pdf_cache.store(cache_key, pdf_file)
 
                 if keep_intermediates == "all" and intermediates_dir is not None:
                     _copy_intermediates(wd_path, Path(intermediates_dir))
             except subprocess.CalledProcessError as e:
-                error_detail = Renderer._extract_error_from_log(log_file)
+                error_detail = tex_engine.parse_error(log_file)
                 preserved_log = None
                 if log_file.exists():
                     preserved_log = dest.parent / f"{dest.stem}_latex_error.log"
@@ -105,55 +162,214 @@ class Renderer:
                 ):
                     _copy_intermediates(wd_path, Path(intermediates_dir))
 
+                # Auxiliary files from a failed run may be broken: never reuse them
+                for aux_file in Renderer._aux_files(wd_path):
+                    aux_file.unlink(missing_ok=True)
+
                 raise LatexRenderError(
                     message="LaTeX compilation failed",
                     detail=error_detail or f"Process returned code {e.returncode}",
                     log_file=str(preserved_log) if preserved_log else None,
                 ) from e
-        finally:
-            if cwd_ctx is not None:
-                try:
-                    cwd_ctx.__exit__(None, None, None)
-                except Exception:
-                    pass
 
     @staticmethod
-    def _extract_error_from_log(log_file: Path) -> Optional[str]:
+    @contextmanager
+    def _work_dir(
+        dest: Path, build_dir: Optional[Path], keep: Tuple[str, ...] = AUX_SUFFIXES
+    ) -> Iterator[Path]:
+        """Yield an isolated directory to compile ``dest`` in.
+
+        Without ``build_dir`` a throwaway temporary directory is used. Under
+        ``build_dir`` the directory is ``<build_dir>/<stem>`` (kept for
+        inspection), cleared of everything but files with a ``keep`` suffix
+        (auxiliary files and engine state) for each attempt and locked so
+        that two compiles of the same stem never share it concurrently.
         """
-        Extract the most relevant error message from a LaTeX log file.
+        if build_dir is None:
+            with tmpdir(prefix=f"{dest.stem}-") as tmp:
+                yield Path(tmp)
+            return
 
-        Args:
-            log_file: Path to the LaTeX log file
+        work_dir = Path(build_dir).absolute() / dest.stem
+        with Renderer._lock:
+            lock = Renderer._work_dir_locks.setdefault(work_dir, threading.Lock())
+        with lock:
+            if work_dir.exists():
+                for item in work_dir.iterdir():
+                    if item.is_dir():
+                        shutil.rmtree(item, ignore_errors=True)
+                    elif item.suffix not in keep:
+                        item.unlink(missing_ok=True)
+            work_dir.mkdir(parents=True, exist_ok=True)
+            yield work_dir
 
-        Returns:
-            A string containing the extracted error message or None if no error was found
-        """
-        if not log_file.exists():
-            return None
+    @staticmethod
+    def _run_passes(
+        tex_engine: TexEngine,
+        tex_file: Path,
+        work_dir: Path,
+        env: dict,
+        max_passes: int,
+        fmt: Optional[str] = None,
+    ) -> None:
+        # Without earlier auxiliary files the first pass has nothing to
+        # compare with: trust the log, which asks for a rerun when needed
+        cold = not Renderer._aux_files(work_dir)
+        aux_hash = Renderer._aux_hash(work_dir)
+        for pass_number in range(max_passes):
+            tex_engine.run(tex_file, work_dir, env, fmt)
+            if pass_number == 0 and cold:
+                log_file = tex_engine.log_file(work_dir / tex_file.name)
+                if not Renderer._rerun_requested(log_file):
+                    break
+            new_aux_hash = Renderer._aux_hash(work_dir)
+            if new_aux_hash == aux_hash:
+                break
+            aux_hash = new_aux_hash
 
+    @staticmethod
+    def _rerun_requested(log_file: Path) -> bool:
         try:
-            with open(log_file, "r", encoding="utf-8", errors="ignore") as f:
-                log_content = f.read()
-
-            # Common LaTeX error patterns to search for
-            error_patterns = [
-                # Look for lines containing "! LaTeX Error:"
-                r"! LaTeX Error: ([^\n\r]*)",
-                # Look for lines containing "! Package error:"
-                r"! Package [^\n\r]* Error: ([^\n\r]*)",
-                # Look for any other error
-                r"! ([^\n\r]*)",
-            ]
-
-            # Try to find the first matching error pattern
-            import re
-
-            for pattern in error_patterns:
-                matches = re.search(pattern, log_content)
-                if matches and matches.group(1):
-                    return matches.group(1).strip()
+            log = log_file.read_text(encoding="utf-8", errors="ignore")
+        except OSError:
+            return False
+        return RERUN_PATTERN.search(log) is not None
+
+    @staticmethod
+    def _split_preamble(
+        tex_code: str, tex_engine: TexEngine
+    ) -> Optional[Tuple[str, str]]:
+        """Split ``tex_code`` into ``(preamble, body)`` when precompiling the
+        preamble is enabled, supported by the engine and worth it."""
+        if not tex_engine.supports_formats or not config.getboolean(
+            "latex", "precompile_preamble", fallback=False
+        ):
+            return None
+        preamble, begin, body = tex_code.partition("\\begin{document}")
+        if not begin or not re.search(r"\\(usepackage|RequirePackage)\b", preamble):
+            return None
+        return preamble, begin + body
 
+    @staticmethod
+    def _precompiled_format(
+        preamble: str, tex_engine: TexEngine, work_dir: Path, env: dict
+    ) -> Optional[str]:
+        """Place the format for ``preamble`` in ``work_dir``, dumping and caching
+        it first if needed. Returns the format name, or None to compile from
+        the full source (no cache, or the preamble cannot be dumped)."""
+        fmt_cache = FormatCache.from_config()
+        if fmt_cache is None:
             return None
-        except Exception:
-            # If anything goes wrong while parsing the log, just return None
+        key = FormatCache.make_key(preamble, tex_engine.identity())
+        with Renderer._lock:
+            if key in Renderer._failed_formats:
+                return None
+            lock = Renderer._format_locks.setdefault(key, threading.Lock())
+
+        fmt_file = work_dir / f"{key}.fmt"
+        with lock:
+            if fmt_cache.fetch(key, fmt_file):
+                return key
+            with tmpdir(prefix="fmt-") as fmt_dir:
+                preamble_file = fmt_dir / "preamble.tex"
+                write(preamble, preamble_file)
+                built = fmt_dir / f"{key}.fmt"
+                try:
+                    subprocess.check_call(
+                        tex_engine.format_command(preamble_file, key),
+                        cwd=str(fmt_dir),
+                        env=env,
+                    )
+                except (subprocess.CalledProcessError, OSError):
+                    pass
+                if not built.is_file():
+                    with Renderer._lock:
+                        Renderer._failed_formats.add(key)
+                    return None
+                fmt_cache.store(key, built)
+                shutil.copyfile(str(built), str(fmt_file))
+        return key
+
+    @staticmethod
+    def _max_passes(max_passes: Optional[int] = None) -> int:
+        if max_passes is None:
+            max_passes = config.getint(
+                "latex", "max_passes", fallback=DEFAULT_MAX_PASSES
+            )
+        return max(1, max_passes)
+
+    @staticmethod
+    def _aux_files(work_dir: Path) -> List[Path]:
+        return sorted(
+            item
+            for item in work_dir.iterdir()
+            if item.suffix in AUX_SUFFIXES and item.is_file()
+        )
+
+    @staticmethod
+    def _aux_hash(work_dir: Path) -> str:
+        digest = hashlib.md5()
+        for aux_file in Renderer._aux_files(work_dir):
+            digest.update(aux_file.name.encode("utf-8"))
+            digest.update(aux_file.read_bytes())
+        return digest.hexdigest()
+
+    @staticmethod
+    def _remember(dest: Path, tex_hash: str) -> None:
+        with Renderer._lock:
+            Renderer._cache[dest] = tex_hash
+
+    @staticmethod
+    def _is_unchanged(tex_code: str, dest: Path) -> bool:
+        with Renderer._lock:
+            cached = Renderer._cache.get(dest)
+        return cached == Renderer._generate_hash(tex_code)
+
+    @staticmethod
+    def render_many(
+        jobs: List[dict],
+        *,
+        max_workers: Optional[int] = None,
+        build_dir: Optional[Path] = None,
+        intermediates_dir: Optional[Path] = None,
+        keep_intermediates: str = "none",
+    ) -> List[Tuple[dict, Exception]]:
+        """Compile several PDF jobs, concurrently when ``max_workers`` > 1.
+
+        Each job is a dict with ``tex_code`` and ``dest`` (see ``Target.prepare``).
+        Compiles run in a thread pool: the heavy lifting happens in the TeX
+        subprocesses and every compile gets its own work directory.
+        A failing job does not stop the others: failures are returned as
+        ``(job, error)`` pairs, in job order, once every compile has finished.
+        """
+        render_kwargs = dict(
+            build_dir=build_dir,
+            intermediates_dir=intermediates_dir,
+            keep_intermediates=keep_intermediates,
+        )
+        workers = min(max_workers or os.cpu_count() or 1, max(len(jobs), 1))
+
+        def _run(job: dict) -> Optional[Exception]:
+            try:
+                Renderer.render(
+                    job["tex_code"],
+                    job["dest"],
+                    False,
+                    engine=job.get("engine"),
+                    **render_kwargs,
+                )
+            except Exception as err:  # pylint: disable=broad-except
+                return err
             return None
+
+        if workers <= 1:
+            results = [_run(job) for job in jobs]
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_run, jobs))
+        return [(job, err) for job, err in zip(jobs, results) if err is not None]
+
+    @staticmethod
+    def _extract_error_from_log(log_file: Path) -> Optional[str]:
+        """Extract the most relevant error message from a LaTeX log file."""
+        return extract_error_from_log(log_file)
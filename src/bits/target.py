@@ -1,4 +1,5 @@
 import datetime as _dt
+import hashlib
 import uuid
 from pathlib import Path
 from typing import List
@@ -6,6 +7,7 @@ from typing import List
 from jinja2 import Template
 
 from .collections import Element
+from .helpers import fingerprint
 from .models import TargetModel
 from .renderer import Renderer
 
@@ -18,6 +20,7 @@ class Target(Element):
         dest: Path,
         name: str | None = None,
         tags: List[str] | None = None,
+        engine: str | None = None,
     ):
         super().__init__(name=name, tags=tags)
 
@@ -25,6 +28,7 @@ class Target(Element):
         self.template_path = Path(template.filename).resolve()
 
         self.context: dict = context
+        self.engine: str | None = engine
 
         if dest.suffix == "":
             self.dest: Path = dest / f"{self.name or self.id}.pdf"
@@ -34,8 +38,15 @@ class Target(Element):
             raise ValueError("Target destination must be a pdf file")
 
         self._last_rendered_hash = None
+        # Whether the resolved inputs changed since the last successful render;
+        # maintained by the registry across reloads.
+        self.dirty: bool = True
+        self._fingerprint: str | None = None
+        # What the target was resolved and renders from, by kind (see
+        # bits.dependencies); recorded by the registry when loading.
+        self.dependencies: dict[str, set[str]] = {}
         # Resolved output specs, populated by RegistryFile after construction.
-        # Each entry: {name, template, context, dest (Path|None), suffix, default}
+        # Each entry: {name, template, context, dest (Path|None), suffix, default, engine}
         self._outputs: list[dict] = []
 
     def __str__(self) -> str:
@@ -61,8 +72,33 @@ class Target(Element):
             template=str(self.template_path),
             context=self.context,
             dest=str(self.dest),
+            engine=self.engine,
         )
 
+    def fingerprint(self) -> str:
+        """Content hash of the resolved inputs: templates, context, outputs."""
+        outputs = [
+            {**out, "template": _template_token(out["template"])}
+            for out in self._outputs
+        ]
+        return fingerprint(
+            [
+                self.name,
+                self.tags,
+                str(self.dest),
+                self.engine,
+                _template_token(self.template),
+                self.context,
+                outputs,
+            ]
+        )
+
+    def dependency_files(self) -> set[str]:
+        """Absolute paths of the files this target depends on."""
+        from .dependencies import FILE_KINDS  # pylint: disable=import-outside-toplevel
+
+        return {path for kind in FILE_KINDS for path in self.dependencies.get(kind, ())}
+
     def render_tex_code(self) -> str:
         tex_code: str = self.template.render(**self.context)
         return tex_code
@@ -95,7 +131,7 @@ class Target(Element):
             return base.parent / f"{base.stem}-{output['suffix']}{base.suffix}"
         return base
 
-    def _render_one(
+    def _prepare_one(
         self,
         template: Template,
         context: dict,
@@ -103,11 +139,11 @@ class Target(Element):
         do_tex: bool,
         do_pdf: bool,
         *,
-        build_dir: Path | None = None,
-        intermediates_dir: Path | None = None,
-        keep_intermediates: str = "none",
         unique_strategy: str | None = None,
-    ) -> None:
+        engine: str | None = None,
+    ) -> list[dict]:
+        """Render TeX for one output, write it if requested, and return the
+        pending PDF compile job (if any) as ``{target, tex_code, dest, engine}``."""
         tex_code = template.render(**context)
 
         final_dest = dest
@@ -123,39 +159,35 @@ class Target(Element):
         if do_tex:
             Renderer.render(tex_code, final_dest, True)
         if do_pdf:
-            Renderer.render(
-                tex_code,
-                final_dest,
-                False,
-                build_dir=build_dir,
-                intermediates_dir=intermediates_dir,
-                keep_intermediates=keep_intermediates,
-            )
+            return [
+                {
+                    "target": self.name or str(self.id),
+                    "tex_code": tex_code,
+                    "dest": final_dest,
+                    "engine": engine,
+                }
+            ]
+        return []
 
-    def render(
+    def prepare(
         self,
         output_tex: bool = False,
         *,
         pdf: bool | None = None,
         tex: bool | None = None,
         both: bool = False,
-        build_dir: Path | None = None,
-        intermediates_dir: Path | None = None,
-        keep_intermediates: str = "none",
         unique_strategy: str | None = None,
         output_name: str | None = None,
         all_outputs: bool = False,
-    ) -> None:
+    ) -> list[dict]:
+        """Render the TeX of the selected outputs and return pending PDF jobs.
+
+        TeX outputs are written immediately; PDF compilation is left to the
+        caller (see ``Renderer.render_many``).
+        """
         do_pdf = bool(both or (pdf is True and not output_tex))
         do_tex = bool(output_tex or tex or both)
 
-        render_kwargs = dict(
-            build_dir=build_dir,
-            intermediates_dir=intermediates_dir,
-            keep_intermediates=keep_intermediates,
-            unique_strategy=unique_strategy,
-        )
-
         if self._outputs:
             if all_outputs:
                 to_render = self._outputs
@@ -170,26 +202,75 @@ class Target(Element):
                 to_render = [out]
             else:
                 to_render = self._get_default_outputs()
+            jobs: list[dict] = []
             for out in to_render:
-                self._render_one(
-                    out["template"],
-                    out["context"],
-                    self._compute_output_dest(out),
-                    do_tex,
-                    do_pdf,
-                    **render_kwargs,
-                )
-        else:
-            if output_name is not None:
-                raise ValueError(
-                    f"Target '{self.name}' has no outputs defined;"
-                    " --output requires outputs to be configured"
+                jobs.extend(
+                    self._prepare_one(
+                        out["template"],
+                        out["context"],
+                        self._compute_output_dest(out),
+                        do_tex,
+                        do_pdf,
+                        unique_strategy=unique_strategy,
+                        engine=out.get("engine") or self.engine,
+                    )
                 )
-            self._render_one(
-                self.template,
-                self.context,
-                self.dest,
-                do_tex,
-                do_pdf,
-                **render_kwargs,
+            return jobs
+
+        if output_name is not None:
+            raise ValueError(
+                f"Target '{self.name}' has no outputs defined;"
+                " --output requires outputs to be configured"
             )
+        return self._prepare_one(
+            self.template,
+            self.context,
+            self.dest,
+            do_tex,
+            do_pdf,
+            unique_strategy=unique_strategy,
+            engine=self.engine,
+        )
+
+    def render(
+        self,
+        output_tex: bool = False,
+        *,
+        pdf: bool | None = None,
+        tex: bool | None = None,
+        both: bool = False,
+        build_dir: Path | None = None,
+        intermediates_dir: Path | None = None,
+        keep_intermediates: str = "none",
+        unique_strategy: str | None = None,
+        output_name: str | None = None,
+        all_outputs: bool = False,
+    ) -> None:
+        jobs = self.prepare(
+            output_tex,
+            pdf=pdf,
+            tex=tex,
+            both=both,
+            unique_strategy=unique_strategy,
+            output_name=output_name,
+            all_outputs=all_outputs,
+        )
+        for job in jobs:
+            Renderer.render(
+                job["tex_code"],
+                job["dest"],
+                False,
+                build_dir=build_dir,
+                intermediates_dir=intermediates_dir,
+                keep_intermediates=keep_intermediates,
+                engine=job["engine"],
+            )
+
+
+def _template_token(template: Template) -> str:
+    filename = template.filename or ""
+    try:
+        digest = hashlib.sha256(Path(filename).read_bytes()).hexdigest()
+    except OSError:
+        digest = ""
+    return f"{filename}:{digest}"
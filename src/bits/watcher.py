@@ -1,16 +1,236 @@
+import logging
+import threading
 import time
 from pathlib import Path
-from threading import Timer
-from typing import Callable, List
+from typing import Callable, Dict, Iterable, List, Set
 
 from watchdog.events import FileSystemEvent, FileSystemEventHandler
 from watchdog.observers import Observer
 
+from .config import config
 
-class Watcher(FileSystemEventHandler):
-    def __init__(self, path: Path):
+logger = logging.getLogger(__name__)
+
+DEFAULT_DEBOUNCE = 1.0
+
+
+def debounce_interval() -> float:
+    """Quiet window in seconds before a batch of changes is handled
+    (``[watch] debounce``)."""
+    return max(config.getfloat("watch", "debounce", fallback=DEFAULT_DEBOUNCE), 0.0)
+
+
+class ChangeBatch:
+    """Modification events collected over one quiet window, one per path.
+
+    Listeners receive a batch; ``ChangeBatch.of`` also accepts a single event,
+    so they can be called either way.
+    """
+
+    def __init__(self, events: Iterable[FileSystemEvent]):
+        self.events: List[FileSystemEvent] = list(events)
+
+    @classmethod
+    def of(cls, change) -> "ChangeBatch":
+        return change if isinstance(change, cls) else cls([change])
+
+    @property
+    def paths(self) -> List[str]:
+        return [event.src_path for event in self.events]
+
+    @property
+    def src_path(self) -> str:
+        # For listeners written against single events
+        return self.events[0].src_path
+
+    def __iter__(self):
+        return iter(self.events)
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+
+class ChangeQueue:
+    """Collects change events and hands them to ``handler`` in batches.
+
+    A batch is handed over once no event arrived for ``quiet`` seconds
+    (default ``[watch] debounce``); a path changed several times appears once.
+    Batches are handled one at a time on the queue's thread, so events
+    arriving during a build form the next batch instead of a concurrent one.
+    """
+
+    def __init__(
+        self, handler: Callable[[ChangeBatch], None], quiet: float | None = None
+    ):
+        self._handler = handler
+        self._quiet = quiet
+        self._pending: Dict[str, FileSystemEvent] = {}
+        self._last_event = 0.0
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._stopped = False
+        # One batch at a time, whether handled by the thread or by flush()
+        self._handling = threading.Lock()
+
+    @property
+    def quiet(self) -> float:
+        return debounce_interval() if self._quiet is None else self._quiet
+
+    def put(self, event: FileSystemEvent) -> None:
+        with self._cond:
+            # Latest event per path, ordered by last change
+            self._pending.pop(event.src_path, None)
+            self._pending[event.src_path] = event
+            self._last_event = time.monotonic()
+            if self._thread is None and not self._stopped:
+                self._thread = threading.Thread(
+                    target=self._run, name="bits-change-queue", daemon=True
+                )
+                self._thread.start()
+            self._cond.notify_all()
+
+    def take(self) -> ChangeBatch | None:
+        """Remove and return the pending events, if any."""
+        with self._cond:
+            return self._take()
+
+    def flush(self) -> None:
+        """Handle the pending events now, on the calling thread."""
+        batch = self.take()
+        if batch is not None:
+            self._handle(batch)
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+            thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def _take(self) -> ChangeBatch | None:
+        if not self._pending:
+            return None
+        batch = ChangeBatch(self._pending.values())
+        self._pending = {}
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._stopped:
+                    self._cond.wait()
+                # Wait until the changes settle
+                while not self._stopped:
+                    remaining = self._last_event + self.quiet - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                if self._stopped:
+                    return
+                batch = self._take()
+            if batch is not None:
+                self._handle(batch)
+
+    def _handle(self, batch: ChangeBatch) -> None:
+        try:
+            with self._handling:
+                self._handler(batch)
+        except Exception:  # pylint: disable=broad-except
+            # Keep watching: the next batch may succeed
+            logger.exception("Error while handling changes: %s", batch.paths)
+
+
+class WatchService(FileSystemEventHandler):
+    """One file system observer shared by every watching registry.
+
+    Watchers subscribe the files they follow; each directory is scheduled
+    once. Modifications of subscribed files go through a ``ChangeQueue``, and
+    each batch is dispatched once to every listener of the owning watchers.
+    The observer thread runs only while some watcher is subscribed, i.e. in
+    ``bits build --watch``.
+    """
+
+    def __init__(self, quiet: float | None = None) -> None:
         super().__init__()
+        self._lock = threading.RLock()
+        self._observer: Observer | None = None
+        self._owners: Dict[str, Set["Watcher"]] = {}
+        self._scheduled_dirs: Set[str] = set()
+        self._quiet = quiet
+        self._queue: ChangeQueue | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._observer is not None
+
+    def subscribe(self, watcher: "Watcher", paths: Iterable[Path | str]) -> None:
+        with self._lock:
+            if self._observer is None:
+                self._observer = Observer()
+                self._scheduled_dirs = set()
+                self._queue = ChangeQueue(self.dispatch, quiet=self._quiet)
+                self._observer.start()
+            for path in paths:
+                path = str(path)
+                self._owners.setdefault(path, set()).add(watcher)
+                directory = str(Path(path).parent)
+                if directory not in self._scheduled_dirs:
+                    self._observer.schedule(self, directory, recursive=False)
+                    self._scheduled_dirs.add(directory)
 
+    def unsubscribe(self, watcher: "Watcher") -> None:
+        with self._lock:
+            for path in list(self._owners):
+                self._owners[path].discard(watcher)
+                if not self._owners[path]:
+                    del self._owners[path]
+            if self._owners or self._observer is None:
+                return
+            observer, self._observer = self._observer, None
+            queue, self._queue = self._queue, None
+        observer.stop()
+        observer.join()
+        if queue is not None:
+            queue.stop()
+
+    def on_modified(self, event: FileSystemEvent) -> None:
+        with self._lock:
+            queue = self._queue if event.src_path in self._owners else None
+        if queue is not None:
+            queue.put(event)
+
+    def flush(self) -> None:
+        """Dispatch the queued changes now, on the calling thread."""
+        with self._lock:
+            queue = self._queue
+        if queue is not None:
+            queue.flush()
+
+    def dispatch(self, batch: ChangeBatch) -> None:
+        """Hand each listener the events of ``batch`` its watchers own, in
+        one call, however many watchers it is registered on."""
+        events: Dict[Callable, List[FileSystemEvent]] = {}
+        for event in batch:
+            with self._lock:
+                owners = list(self._owners.get(event.src_path, ()))
+            for watcher in owners:
+                for listener in watcher.listeners:
+                    listener_events = events.setdefault(listener, [])
+                    if event not in listener_events:
+                        listener_events.append(event)
+        for listener, listener_events in events.items():
+            listener(ChangeBatch(listener_events))
+
+
+watch_service = WatchService()
+
+
+class Watcher:
+    """A registry's subscription to ``watch_service``: its own file plus the
+    files its targets depend on, reported to its listeners in batches."""
+
+    def __init__(self, path: Path, service: WatchService | None = None):
         if not path.exists():
             raise FileNotFoundError(f"Path {path} does not exist")
 
@@ -18,37 +238,42 @@ class Watcher(FileSystemEventHandler):
             raise ValueError(f"Path {path} is not a markdown or yaml file")
 
         self._path: Path = path
+        self._service: WatchService = service or watch_service
+        self._started = False
 
-        self._observer: Observer = Observer()
-        self._observer.schedule(self, str(self._path.parent), recursive=False)
-
-        self._listeners: List[Callable[[FileSystemEvent], None]] = []
-        self._last_modified = 0
-        self._debounce_timer = None
+        self._listeners: List[Callable[[ChangeBatch], None]] = []
+        # Extra files (templates, plugins, ...) reported alongside the registry
+        self._files: Set[str] = set()
 
-    def add_listener(self, on_event: Callable[[FileSystemEvent], None]) -> None:
+    def add_listener(self, on_event: Callable[[ChangeBatch], None]) -> None:
         if on_event not in self._listeners:
             self._listeners.append(on_event)
 
-    def on_modified(self, event: FileSystemEvent) -> None:
-        if event.src_path == str(self._path):
-            current_time = time.time()
-            if current_time - self._last_modified < 1:  # Debounce interval of 1 second
-                if self._debounce_timer:
-                    self._debounce_timer.cancel()
-                self._debounce_timer = Timer(1, self._notify_listeners, [event])
-                self._debounce_timer.start()
-            else:
-                self._notify_listeners(event)
-            self._last_modified = current_time
-
-    def _notify_listeners(self, event: FileSystemEvent) -> None:
-        for listener in self._listeners:
-            listener(event)
+    def watch_files(self, paths: Iterable[Path | str]) -> None:
+        """Also notify listeners when one of ``paths`` is modified."""
+        new_files = set()
+        for path in paths:
+            path = Path(path)
+            if path == self._path or not path.exists():
+                continue
+            if str(path) not in self._files:
+                new_files.add(str(path))
+        self._files |= new_files
+        if self._started and new_files:
+            self._service.subscribe(self, new_files)
+
+    @property
+    def listeners(self) -> List[Callable[[ChangeBatch], None]]:
+        return list(self._listeners)
 
     def start(self) -> None:
-        self._observer.start()
+        if self._started:
+            return
+        self._started = True
+        self._service.subscribe(self, {str(self._path)} | self._files)
 
     def stop(self) -> None:
-        self._observer.stop()
-        self._observer.join()
+        if not self._started:
+            return
+        self._started = False
+        self._service.unsubscribe(self)
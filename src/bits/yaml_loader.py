@@ -7,12 +7,13 @@ from .config import config
 
 var_pattern = re.compile(r"\$\{([^}]+)\}")
 
+# Legacy registration: yaml.Loader/FullLoader resolve plain scalars starting
+# with ``${`` to ``!var``, and yaml.Dumper quotes such strings on dump.
+# Registries are loaded with BitsLoader below, which interpolates in a post-pass.
 yaml.add_implicit_resolver("!var", var_pattern)
 
 
-def interpolated_var_constructor(loader, node):
-    value = loader.construct_scalar(node)
-
+def interpolate(value: str) -> str:
     def replace_var(match):
         variable_name = match.group(1)
         if config.has_option("variables", variable_name):
@@ -30,8 +31,47 @@ def interpolated_var_constructor(loader, node):
     return var_pattern.sub(replace_var, value)
 
 
+def interpolated_var_constructor(loader, node):
+    return interpolate(loader.construct_scalar(node))
+
+
 yaml.add_constructor("!var", interpolated_var_constructor)
 
 
-def load_yaml(src: str) -> dict:
-    return yaml.load(src, Loader=yaml.FullLoader)
+class PyBitsLoader(yaml.SafeLoader):  # pylint: disable=too-many-ancestors
+    """Pure-Python safe loader, used when libyaml is not available."""
+
+
+PyBitsLoader.add_constructor("!var", interpolated_var_constructor)
+
+HAS_LIBYAML = hasattr(yaml, "CSafeLoader")
+
+if HAS_LIBYAML:
+
+    class CBitsLoader(yaml.CSafeLoader):  # pylint: disable=too-many-ancestors
+        """libyaml-backed safe loader."""
+
+    CBitsLoader.add_constructor("!var", interpolated_var_constructor)
+    BitsLoader = CBitsLoader
+else:  # pragma: no cover - depends on how PyYAML was built
+    BitsLoader = PyBitsLoader
+
+
+def _interpolate_strings(data):
+    # Same rule as the legacy implicit resolver: strings starting with ``${``
+    if isinstance(data, str):
+        return interpolate(data) if var_pattern.match(data) else data
+    if isinstance(data, dict):
+        return {
+            _interpolate_strings(key): _interpolate_strings(value)
+            for key, value in data.items()
+        }
+    if isinstance(data, list):
+        return [_interpolate_strings(item) for item in data]
+    return data
+
+
+def load_yaml(src: str, loader=None) -> dict:
+    """Parse ``src`` (libyaml when available) and interpolate ``${var}``
+    references to ``[variables]`` in string values."""
+    return _interpolate_strings(yaml.load(src, Loader=loader or BitsLoader))
@@ -33,6 +33,14 @@ def bitsfiles(resources):  # pylint: disable=redefined-outer-name
     return files
 
 
+@pytest.fixture(scope="session", autouse=True)
+def isolated_cache_dir(tmp_path_factory):
+    """Keep on-disk build caches out of the working tree during tests."""
+    if not config.has_section("cache"):
+        config.add_section("cache")
+    config.set("cache", "dir", str(tmp_path_factory.mktemp("bitscache")))
+
+
 # Ensure tests run without a repo-level .bitsrc by pointing to tests/resources/.bitsrc
 BITS_CONFIG_FILE = (Path(__file__).parent / "resources" / ".bitsrc").resolve()
 os.environ.setdefault("BITS_CONFIG", str(BITS_CONFIG_FILE))
@@ -0,0 +1,50 @@
+import pytest
+from typer.testing import CliRunner
+
+from bits.bit import Bit
+from bits.cli.main import app
+from bits.exceptions import TemplateLoadError
+
+
+def test_bits_compile_on_first_render_only():
+    bit = Bit(src={"default": "A \\VAR{ x }", "other": "B"}, defaults={"x": 1})
+
+    assert not bit._templates
+    assert bit.render() == "A 1"
+    assert set(bit._templates) == {"default"}
+    assert bit.render() == "A 1"
+    assert set(bit._templates) == {"default"}
+
+
+def test_syntax_errors_surface_on_render_or_check():
+    bit = Bit(src={"ok": "fine", "bad": "\\BLOCK{ if x }"})
+
+    assert bit.render("ok") == "fine"
+    with pytest.raises(TemplateLoadError):
+        bit.render("bad")
+    with pytest.raises(TemplateLoadError):
+        bit.check()
+
+
+def test_check_command_reports_broken_bits(tmp_path):
+    registry = tmp_path / "registry.yml"
+    registry.write_text(
+        "bits:\n"
+        "  - name: Good\n"
+        "    src: fine\n"
+        "  - name: Broken\n"
+        '    src: "\\\\BLOCK{ for x in y }"\n'
+    )
+    runner = CliRunner()
+
+    result = runner.invoke(app, ["check", str(registry)])
+
+    assert result.exit_code == 1
+    assert "Broken" in result.output
+    assert "Good" not in result.output
+    assert "1 of 2 bits failed" in result.output
+
+    registry.write_text("bits:\n  - name: Good\n    src: fine\n")
+    result = runner.invoke(app, ["check", str(registry)])
+    assert result.exit_code == 0, result.output
+    assert "All 1 bits compiled" in result.output
@@ -0,0 +1,49 @@
+# pylint: disable=protected-access
+from unittest.mock import patch
+
+import pytest
+
+from bits.config import config
+from bits.env import EnvironmentFactory
+
+
+@pytest.fixture(autouse=True)
+def jinja_cache_dir(tmp_path):
+    if not config.has_section("jinja"):
+        config.add_section("jinja")
+    config.set("jinja", "cache_dir", str(tmp_path / "jinja"))
+    EnvironmentFactory.clear_cache()
+    yield tmp_path / "jinja"
+    config.remove_option("jinja", "cache_dir")
+    EnvironmentFactory.clear_cache()
+
+
+def test_bit_sources_are_compiled_once_across_processes(jinja_cache_dir):
+    assert EnvironmentFactory.from_string("Hi \\VAR{ who }").render(who="A") == "Hi A"
+    assert list(jinja_cache_dir.rglob("__jinja2_string-*.cache"))
+
+    # A fresh process: empty in-memory caches, bytecode still on disk
+    EnvironmentFactory.clear_cache()
+    with patch("jinja2.Environment.compile", side_effect=AssertionError):
+        template = EnvironmentFactory.from_string("Hi \\VAR{ who }")
+    assert template.render(who="B") == "Hi B"
+
+
+def test_loader_templates_use_the_bytecode_cache(tmp_path, jinja_cache_dir):
+    (tmp_path / "doc.tex.j2").write_text("Doc \\VAR{ n }")
+
+    env = EnvironmentFactory.get(templates_folder=tmp_path)
+    assert env.get_template("doc.tex.j2").render(n=1) == "Doc 1"
+    assert len(list(jinja_cache_dir.rglob("__jinja2_*.cache"))) == 1
+
+
+def test_environments_with_other_syntax_do_not_share_bytecode(jinja_cache_dir):
+    EnvironmentFactory.from_string("\\VAR{ x }")
+    config.add_section("jinja.syntax")
+    try:
+        config.set("jinja.syntax", "variable_start_string", "<<")
+        config.set("jinja.syntax", "variable_end_string", ">>")
+        assert EnvironmentFactory.from_string("\\VAR{ x }").render(x=1) == "\\VAR{ x }"
+    finally:
+        config.remove_section("jinja.syntax")
+    assert len([p for p in jinja_cache_dir.iterdir() if p.is_dir()]) == 2
@@ -0,0 +1,133 @@
+import pytest
+
+from bits.collections import Collection, Element
+from bits.collections.element import compile_name_pattern
+
+
+def _collection(count):
+    return Collection(Element, [Element(name=f"e{i}") for i in range(count)])
+
+
+def test_duplicate_ids_are_rejected():
+    coll = _collection(3)
+
+    with pytest.raises(ValueError, match="already exists"):
+        coll.append(coll[1])
+    with pytest.raises(ValueError, match="already exists"):
+        coll.insert(0, coll[2])
+    assert len(coll) == 3
+
+
+def test_find_by_id_accepts_uuid_or_string():
+    coll = _collection(3)
+    element = coll[2]
+
+    assert coll.find_by_id(element.id) is element
+    assert coll.find_by_id(str(element.id)) is element
+    assert element.match_by_id(str(element.id))
+    with pytest.raises(ValueError, match="not found"):
+        coll.find_by_id("missing")
+
+
+def test_index_follows_mutations():
+    coll = _collection(4)
+    first, second, third, fourth = list(coll)
+
+    del coll[1]
+    assert second not in coll
+    with pytest.raises(ValueError):
+        coll.find_by_id(second.id)
+    coll.append(second)
+    assert coll.position_of(second.id) == 3
+
+    replacement = Element(name="new")
+    coll[0] = replacement
+    assert first not in coll
+    assert coll.find_by_id(replacement.id) is replacement
+
+    coll.insert(0, first)
+    assert [coll.position_of(e.id) for e in (first, replacement, third, fourth)] == [
+        0,
+        1,
+        2,
+        3,
+    ]
+    assert coll.index(fourth) == 3
+
+    coll.clear()
+    assert len(coll) == 0
+    coll.append(first)
+    assert coll.query(id_=str(first.id), name="e0")[0] is first
+
+
+def _bank():
+    return Collection(
+        Element,
+        [
+            Element(name="a", tags=["x", "y"], kind="ex", level=1),
+            Element(name="b", tags=["x"], kind="th", level=2),
+            Element(name="c", tags=["y"], kind="ex", level=2, author="me"),
+            Element(name="d", kind="ex"),
+        ],
+    )
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ({"tags": ["x"]}, ["a", "b"]),
+        ({"tags": ["x", "y"]}, ["a"]),
+        ({"kind": "ex", "level": 2}, ["c"]),
+        ({"kind": "ex", "name": "[ad]"}, ["a", "d"]),
+        ({"author": "me", "tags": ["x"]}, []),
+        ({"num": 3}, []),
+        ({"tags": []}, []),
+    ],
+)
+def test_filter_uses_indexes_with_scan_semantics(query, expected):
+    coll = _bank()
+    scanned = [e.name for e in coll if e.match_query(**query)]
+
+    assert [e.name for e in coll.filter(**query)] == scanned == expected
+
+
+def test_filter_indexes_are_invalidated_on_mutation():
+    coll = _bank()
+    assert [e.name for e in coll.filter(kind="ex")] == ["a", "c", "d"]
+
+    del coll[0]
+    coll.insert(0, Element(name="z", kind="ex", tags=["x"]))
+    coll[1] = Element(name="w", kind="ex")
+
+    assert [e.name for e in coll.filter(kind="ex")] == ["z", "w", "c", "d"]
+    assert [e.name for e in coll.filter(tags=["x"])] == ["z"]
+
+
+def test_name_queries_keep_regex_prefix_semantics():
+    coll = Collection(
+        Element,
+        [Element(name=n) for n in ["Free fall", "Free", "Friction", "free", "F.x"]]
+        + [Element()],
+    )
+
+    assert [e.name for e in coll.filter(name="Free")] == ["Free fall", "Free"]
+    assert [e.name for e in coll.filter(name="Fr")] == ["Free fall", "Free", "Friction"]
+    assert [e.name for e in coll.filter(name="F.")] == [
+        "Free fall",
+        "Free",
+        "Friction",
+        "F.x",
+    ]
+    assert [e.name for e in coll.filter(name="Free$")] == ["Free"]
+    assert not coll.filter(name="Gravity")
+
+
+def test_name_patterns_are_compiled_once():
+    compile_name_pattern.cache_clear()
+    coll = Collection(Element, [Element(name=f"bit-{i}") for i in range(50)])
+
+    coll.filter(name=r"bit-\d$")
+    coll.filter(name=r"bit-\d$")
+
+    info = compile_name_pattern.cache_info()
+    assert (info.misses, info.hits) == (1, 99)
@@ -0,0 +1,78 @@
+from typer.testing import CliRunner
+
+from bits.cli.main import app
+from bits.registry.registryfile import RegistryFile
+
+
+def _write_tree(tmp_path):
+    (tmp_path / "header.tex.j2").write_text("Header\n")
+    (tmp_path / "main.tex.j2").write_text(
+        "\\BLOCK{ include 'header.tex.j2' }"
+        "\\BLOCK{ for b in blocks }\\VAR{ b.render() }\\BLOCK{ endfor }"
+    )
+    (tmp_path / "plain.tex.j2").write_text("Plain")
+    (tmp_path / "bank.yml").write_text(
+        "bits:\n"
+        "  - name: Remote\n"
+        "    src: remote\n"
+        "constants:\n"
+        "  - name: g\n"
+        "    symbol: g\n"
+        "    value: '9.81'\n"
+    )
+    (tmp_path / "registry.yml").write_text(
+        "targets:\n"
+        "  - name: sheet\n"
+        "    template: ./main.tex.j2\n"
+        "    dest: ./out\n"
+        "    context:\n"
+        "      blocks:\n"
+        "        - registry: ./bank.yml\n"
+        "          query: { name: Remote }\n"
+        "      constants:\n"
+        "        - registry: ./bank.yml\n"
+        "          query: { name: g }\n"
+        "  - name: cover\n"
+        "    template: ./plain.tex.j2\n"
+        "    dest: ./out\n"
+    )
+    return RegistryFile(tmp_path / "registry.yml")
+
+
+def test_targets_record_their_dependencies(tmp_path):
+    registry = _write_tree(tmp_path)
+    sheet, cover = registry.targets
+    root = tmp_path.resolve()
+
+    assert sheet.dependencies["templates"] == {
+        str(root / "main.tex.j2"),
+        str(root / "header.tex.j2"),
+    }
+    assert sheet.dependencies["registries"] == {
+        str(root / "registry.yml"),
+        str(root / "bank.yml"),
+    }
+    assert sheet.dependencies["bits"] == {"Remote"}
+    assert sheet.dependencies["constants"] == {"g"}
+    assert str(root / "bank.yml") not in cover.dependency_files()
+
+
+def test_render_only_targets_depending_on_changed_files(tmp_path):
+    registry = _write_tree(tmp_path)
+    registry.render(tex=True, changed_paths=[tmp_path / "header.tex.j2"])
+
+    assert (tmp_path / "out" / "sheet.tex").exists()
+    assert not (tmp_path / "out" / "cover.tex").exists()
+
+
+def test_deps_command_lists_target_dependencies(tmp_path):
+    _write_tree(tmp_path)
+    result = CliRunner().invoke(
+        app, ["deps", str(tmp_path / "registry.yml"), "--target", "sheet"]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "Target: sheet" in result.output
+    assert "header.tex.j2" in result.output
+    assert "- Remote" in result.output
+    assert "Target: cover" not in result.output
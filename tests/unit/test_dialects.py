@@ -1,5 +1,7 @@
 # pylint: disable=protected-access
+import os
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
@@ -177,3 +179,125 @@ def test_bit_model_stores_dialect():
 
     assert bit.dialect == "testdialect"
     assert bit.to_model().dialect == "testdialect"
+
+
+def _calls(name="testdialect"):
+    return DialectRegistry.resolve(name).function.__globals__["CALLS"]
+
+
+def test_context_independent_transform_runs_once_per_fragment(tmp_path):
+    plugin = _write_plugin(
+        tmp_path,
+        r"""
+CALLS = []
+
+def transform(source, *, metadata=None):
+    CALLS.append(source)
+    return source.replace("@name", r"\VAR{ name }")
+""",
+    )
+    _set_dialect("testdialect", plugin)
+    bit = Bit(src={"default": "Q @name", "solution": "S @name"}, dialect="testdialect")
+
+    assert [bit.render(name=n) for n in ("Ada", "Bob", "Cy")] == [
+        "Q Ada",
+        "Q Bob",
+        "Q Cy",
+    ]
+    assert bit.render("solution", name="Ada") == "S Ada"
+    assert _calls() == ["Q @name", "S @name"]
+
+    # Editing the dialect module invalidates the cached output
+    plugin.write_text(
+        plugin.read_text().replace('r"\\VAR{ name }"', '"X"'), encoding="utf-8"
+    )
+    mtime = plugin.stat().st_mtime_ns + 10**9
+    os.utime(plugin, ns=(mtime, mtime))
+    assert bit.render(name="Ada") == "Q Ada"
+    DialectRegistry.refresh()
+    assert bit.render(name="Ada") == "Q X"
+
+
+def test_context_dependent_transform_is_cached_by_declared_keys(tmp_path):
+    plugin = _write_plugin(
+        tmp_path,
+        r"""
+CALLS = []
+
+def transform(source, *, context=None):
+    CALLS.append(context["seed"])
+    return source.replace("@seed", str(context["seed"])) + r" \VAR{ name }"
+
+transform.context_keys = ["seed"]
+""",
+    )
+    _set_dialect("testdialect", plugin)
+    bit = Bit(src="@seed", dialect="testdialect")
+
+    assert bit.render(seed=1, name="a") == "1 a"
+    assert bit.render(seed=1, name="b") == "1 b"
+    assert bit.render(seed=2, name="a") == "2 a"
+    assert _calls() == [1, 2]
+
+
+def test_undeclared_transform_receiving_context_runs_on_every_render(tmp_path):
+    plugin = _write_plugin(
+        tmp_path,
+        r"""
+CALLS = []
+
+def transform(source, **kwargs):
+    CALLS.append(kwargs["context"]["name"])
+    return kwargs["context"]["name"]
+""",
+    )
+    _set_dialect("testdialect", plugin)
+    bit = Bit(src="x", dialect="testdialect")
+
+    assert [bit.render(name=n) for n in ("a", "b", "a")] == ["a", "b", "a"]
+    # The context is not fingerprinted: the transform runs each time
+    assert _calls() == ["a", "b", "a"]
+    assert not bit._dialect_templates
+
+
+def test_dialect_templates_evict_least_recently_used(tmp_path, monkeypatch):
+    plugin = _write_plugin(
+        tmp_path,
+        r"""
+CALLS = []
+
+def transform(source, *, context=None):
+    CALLS.append(context["seed"])
+    return str(context["seed"])
+
+transform.context_keys = ["seed"]
+""",
+    )
+    _set_dialect("testdialect", plugin)
+    monkeypatch.setattr("bits.bit.MAX_DIALECT_TEMPLATES", 2)
+    bit = Bit(src="x", dialect="testdialect")
+
+    for seed in (1, 2, 1, 3, 1):
+        assert bit.render(seed=seed) == str(seed)
+
+    # 1 stayed hot, so 3 evicted 2 and not 1
+    assert _calls() == [1, 2, 3]
+
+
+def test_resolve_binds_accepted_kwargs_once(tmp_path):
+    plugin = _write_plugin(
+        tmp_path,
+        """
+def transform(source, path=None):
+    return f"{source}@{path}"
+""",
+    )
+    _set_dialect("testdialect", plugin)
+
+    bound = DialectRegistry.resolve("testdialect")
+
+    assert bound.accepted == ("path",)
+    assert bound.context_keys == ()
+    assert bound("src", context={"a": 1}, path="p", metadata={}) == "src@p"
+    with patch("pathlib.Path.stat", side_effect=AssertionError):
+        assert DialectRegistry.resolve("testdialect") is bound
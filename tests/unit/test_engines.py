@@ -0,0 +1,112 @@
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from bits.config import config
+from bits.engines import LatexmkEngine, TectonicEngine, XeLatexEngine, get_engine
+from bits.exceptions import ConfigError, LatexRenderError
+from bits.registry import RegistryFactory
+from bits.renderer import Renderer
+
+
+@pytest.fixture
+def latex_engine_config():
+    if not config.has_section("latex"):
+        config.add_section("latex")
+    yield
+    config.remove_option("latex", "engine")
+
+
+def test_fake_engine_compiles_without_tex(tmp_path):
+    dest = tmp_path / "doc.pdf"
+    with patch("subprocess.check_call") as check_call:
+        Renderer.render("Hello fake engine", dest, engine="fake")
+    check_call.assert_not_called()
+    assert dest.read_bytes().startswith(b"%PDF-")
+
+
+def test_fake_engine_errors_are_parsed_from_the_log(tmp_path):
+    dest = tmp_path / "doc.pdf"
+    with pytest.raises(LatexRenderError) as exc:
+        Renderer.render(r"\FakeError{Undefined control sequence.}", dest, engine="fake")
+    assert "Undefined control sequence." in str(exc.value)
+    assert (tmp_path / "doc_latex_error.log").exists()
+
+
+def test_engine_defaults_to_config(latex_engine_config):
+    assert get_engine().name == "pdflatex"
+    config.set("latex", "engine", "xelatex")
+    assert isinstance(get_engine(), XeLatexEngine)
+    assert get_engine("lualatex").name == "lualatex"
+    with pytest.raises(ConfigError):
+        get_engine("troff")
+
+
+def test_engines_managing_passes_run_once(tmp_path):
+    calls = []
+
+    def fake_check_call(cmd, cwd=None, **kwargs):
+        calls.append(cmd)
+        tex_file = Path(cwd) / cmd[-1]
+        tex_file.with_suffix(".aux").write_text(f"pass {len(calls)}")
+        tex_file.with_suffix(".pdf").write_text("PDF")
+        return 0
+
+    with patch("subprocess.check_call", side_effect=fake_check_call):
+        Renderer.render("latexmk doc", tmp_path / "doc.pdf", engine="latexmk")
+
+    assert calls == [LatexmkEngine().command(Path("doc.tex"))]
+    assert TectonicEngine().command(Path("doc.tex"))[0] == "tectonic"
+
+
+def test_engine_is_selected_per_target_and_output(tmp_path):
+    (tmp_path / "doc.tex.j2").write_text("doc")
+    (tmp_path / "registry.yml").write_text(
+        "targets:\n"
+        "  - name: plain\n"
+        "    template: ./doc.tex.j2\n"
+        "    dest: ./out\n"
+        "  - name: fancy\n"
+        "    template: ./doc.tex.j2\n"
+        "    dest: ./out\n"
+        "    engine: lualatex\n"
+        "    outputs:\n"
+        "      - name: main\n"
+        "        default: true\n"
+        "      - name: print\n"
+        "        suffix: print\n"
+        "        engine: xelatex\n"
+    )
+    registry = RegistryFactory.get(tmp_path / "registry.yml")
+    plain, fancy = registry.targets
+
+    assert [job["engine"] for job in plain.prepare(pdf=True)] == [None]
+    jobs = fancy.prepare(pdf=True, all_outputs=True)
+    assert [job["engine"] for job in jobs] == ["lualatex", "xelatex"]
+
+
+def test_latexmk_work_dir_keeps_its_state(tmp_path):
+    build_dir = tmp_path / "_tmp"
+    found = []
+
+    def fake_check_call(cmd, cwd=None, **kwargs):
+        found.append(sorted(item.suffix for item in Path(cwd).iterdir()))
+        tex_file = Path(cwd) / cmd[-1]
+        for suffix in (".aux", ".fdb_latexmk", ".fls", ".log"):
+            tex_file.with_suffix(suffix).write_text("state")
+        tex_file.with_suffix(".pdf").write_text("PDF")
+        return 0
+
+    for engine in ("latexmk", "latexmk", "pdflatex", "pdflatex"):
+        with patch("subprocess.check_call", side_effect=fake_check_call):
+            Renderer.render(
+                f"{engine} doc {len(found)}",
+                tmp_path / f"{engine}.pdf",
+                build_dir=build_dir,
+                engine=engine,
+            )
+
+    # The second build of each starts from what the first one kept
+    assert found[1] == [".aux", ".fdb_latexmk", ".fls", ".tex"]
+    assert found[-1] == [".aux", ".tex"]
@@ -0,0 +1,196 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from bits.config import config
+from bits.exceptions import RegistryLoadError
+from bits.registry.import_graph import ImportGraph
+from bits.registry.registry_factory import RegistryFactory
+from bits.registry.registryfile import RegistryFile
+
+
+def _write(path, imports=(), bit=None):
+    text = ""
+    if imports:
+        text += "import:\n" + "".join(f"  - registry: ./{i}\n" for i in imports)
+    text += f"bits:\n  - name: {bit or path.stem}\n    src: {path.stem}\n"
+    path.write_text(text)
+
+
+@pytest.fixture
+def diamond(tmp_path):
+    # index -> a, b; a -> c; b -> c
+    _write(tmp_path / "c.yml")
+    _write(tmp_path / "a.yml", ["c.yml"])
+    _write(tmp_path / "b.yml", ["c.yml"])
+    _write(tmp_path / "index.yml", ["a.yml", "b.yml"])
+    return tmp_path
+
+
+@pytest.fixture
+def counted(monkeypatch):
+    calls = {"load": [], "parse": []}
+    load, parse_file = RegistryFile.load, RegistryFile.parse_file
+
+    def counting_load(self, *args, **kwargs):
+        calls["load"].append(self._path.name)
+        return load(self, *args, **kwargs)
+
+    def counting_parse(path, parser=None):
+        calls["parse"].append(path.name)
+        return parse_file(path, parser)
+
+    monkeypatch.setattr(RegistryFile, "load", counting_load)
+    monkeypatch.setattr(RegistryFile, "parse_file", staticmethod(counting_parse))
+    return calls
+
+
+def test_diamond_imports_load_once_in_topological_order(diamond, counted):
+    registry = RegistryFactory.get(diamond / "index.yml")
+
+    assert counted["load"] == ["index.yml", "c.yml", "a.yml", "b.yml"]
+    assert sorted(counted["parse"]) == ["a.yml", "b.yml", "c.yml", "index.yml"]
+    assert [bit.name for bit in registry.bits] == ["index", "a", "c", "b"]
+
+
+def test_changed_shared_import_reloads_each_node_once(diamond, counted):
+    RegistryFactory.get(diamond / "index.yml")
+    counted["load"].clear()
+
+    _write(diamond / "c.yml", bit="renamed")
+    registry = RegistryFactory.get(diamond / "index.yml")
+
+    assert counted["load"] == ["index.yml", "c.yml", "a.yml", "b.yml"]
+    assert "renamed" in [bit.name for bit in registry.bits]
+
+
+def test_levels_group_independent_imports(diamond):
+    root = diamond / "index.yml"
+    graph = ImportGraph.discover(
+        root, RegistryFile.parse_file(root), RegistryFile.parse_file
+    )
+
+    assert graph.levels() == [
+        [diamond / "c.yml"],
+        [diamond / "a.yml", diamond / "b.yml"],
+    ]
+
+
+def test_circular_imports_are_reported(tmp_path):
+    _write(tmp_path / "a.yml", ["b.yml"])
+    _write(tmp_path / "b.yml", ["a.yml"])
+
+    with pytest.raises(RegistryLoadError) as exc:
+        RegistryFactory.get(tmp_path / "a.yml")
+
+    assert "Circular registry import" in str(exc.value.__cause__)
+
+
+def test_independent_imports_load_on_threads(diamond, counted):
+    if not config.has_section("registry"):
+        config.add_section("registry")
+    config.set("registry", "import_jobs", "4")
+    try:
+        registry = RegistryFactory.get(diamond / "index.yml")
+    finally:
+        config.remove_option("registry", "import_jobs")
+
+    assert [bit.name for bit in registry.bits] == ["index", "a", "c", "b"]
+    assert counted["load"].count("c.yml") == 1
+    a, b = (RegistryFactory.get(diamond / f"{n}.yml", as_dep=True) for n in "ab")
+    assert a.deps[0] is b.deps[0] is RegistryFactory.get_fresh(diamond / "c.yml", True)
+
+
+def test_concurrent_gets_build_one_registry(tmp_path, monkeypatch):
+    _write(tmp_path / "shared.yml")
+    loads = []
+    load = RegistryFile.load
+
+    def slow_load(self, *args, **kwargs):
+        loads.append(self._path.name)
+        time.sleep(0.05)
+        return load(self, *args, **kwargs)
+
+    monkeypatch.setattr(RegistryFile, "load", slow_load)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        registries = list(
+            pool.map(
+                lambda _: RegistryFactory.get(tmp_path / "shared.yml", as_dep=True),
+                range(4),
+            )
+        )
+
+    assert all(registry is registries[0] for registry in registries)
+    assert loads == ["shared.yml"]
+
+
+def _chapters(tmp_path, count):
+    for i in range(count):
+        (tmp_path / f"ch{i}.yml").write_text(
+            f"bits:\n  - name: ch{i}\n    src: ${{chapter_dir}}/{i}\n"
+        )
+    _write(tmp_path / "index.yml", [f"ch{i}.yml" for i in range(count)])
+    return tmp_path / "index.yml"
+
+
+@pytest.fixture
+def chapter_dir():
+    if not config.has_section("variables"):
+        config.add_section("variables")
+    config.set("variables", "chapter_dir", "/chapters")
+    yield
+    config.remove_option("variables", "chapter_dir")
+
+
+def parse_in_process(path):
+    """Parse ``path`` and record the parsing process in the model's tags."""
+    model = RegistryFile.parse_file(path)
+    model.tags = [str(os.getpid())]
+    return model
+
+
+def test_imported_files_are_parsed_on_worker_processes(tmp_path, chapter_dir):
+    root = _chapters(tmp_path, 4)
+    model = RegistryFile.parse_file(root)
+
+    serial = ImportGraph.discover(root, model, parse_in_process, jobs=1)
+    parallel = ImportGraph.discover(root, model, parse_in_process, jobs=2)
+
+    assert {m.tags[0] for m in serial.models.values()} == {str(os.getpid())}
+    assert str(os.getpid()) not in {m.tags[0] for m in parallel.models.values()}
+    assert [m.bits for m in parallel.models.values()] == [
+        m.bits for m in serial.models.values()
+    ]
+    assert parallel.models[tmp_path / "ch3.yml"].bits[0].src == "/chapters/3"
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_parse_error_names_the_broken_import(tmp_path, jobs):
+    root = _chapters(tmp_path, 2)
+    (tmp_path / "ch1.yml").write_text("bits: [\n")
+    if not config.has_section("registry"):
+        config.add_section("registry")
+    config.set("registry", "parse_jobs", str(jobs))
+    try:
+        with pytest.raises(RegistryLoadError) as exc:
+            RegistryFactory.get(root)
+    finally:
+        config.remove_option("registry", "parse_jobs")
+
+    assert str(tmp_path / "ch1.yml") in str(exc.value.__cause__)
+
+
+def test_unpicklable_parser_falls_back_to_serial(tmp_path):
+    root = _chapters(tmp_path, 3)
+    parsed = []
+
+    def parse(path):
+        parsed.append(path.name)
+        return RegistryFile.parse_file(path)
+
+    graph = ImportGraph.discover(root, RegistryFile.parse_file(root), parse, jobs=2)
+
+    assert sorted(parsed) == ["ch0.yml", "ch1.yml", "ch2.yml"]
+    assert len(graph.models) == 3
@@ -0,0 +1,95 @@
+from unittest.mock import patch
+
+from bits.registry.registryfile import RegistryFile
+
+TEMPLATE = r"\BLOCK{ for b in blocks }\VAR{ b.render() }\BLOCK{ endfor }"
+
+
+def _write_registry(path, first_src: str) -> None:
+    path.write_text(
+        "targets:\n"
+        "  - name: first\n"
+        "    template: ./doc.tex.j2\n"
+        "    dest: ./out\n"
+        "    context:\n"
+        "      blocks:\n"
+        "        - query: { name: First }\n"
+        "  - name: second\n"
+        "    template: ./doc.tex.j2\n"
+        "    dest: ./out\n"
+        "    context:\n"
+        "      blocks:\n"
+        "        - query: { name: Second }\n"
+        "bits:\n"
+        "  - name: First\n"
+        f"    src: '{first_src}'\n"
+        "  - name: Second\n"
+        "    src: 'second'\n"
+        "constants:\n"
+        "  - name: g\n"
+        "    symbol: g\n"
+        "    value: '9.81'\n"
+    )
+
+
+def _registry(tmp_path, first_src="first"):
+    (tmp_path / "doc.tex.j2").write_text(TEMPLATE)
+    _write_registry(tmp_path / "registry.yml", first_src)
+    return RegistryFile(tmp_path / "registry.yml")
+
+
+def _render_tex(registry):
+    registry.render(tex=True, only_dirty=True)
+
+
+def test_reload_keeps_unchanged_objects(tmp_path):
+    registry = _registry(tmp_path)
+    bits = list(registry.bits)
+    constants = list(registry.constants)
+
+    registry.load()
+
+    assert [b is old for b, old in zip(registry.bits, bits)] == [True, True]
+    assert registry.constants[0] is constants[0]
+    assert registry.bits[0].presets == [{"name": "default"}]
+
+
+def test_only_targets_with_changed_inputs_are_dirty(tmp_path):
+    registry = _registry(tmp_path)
+    assert [t.dirty for t in registry.targets] == [True, True]
+    _render_tex(registry)
+    assert [t.dirty for t in registry.targets] == [False, False]
+
+    second_bit = registry.bits[1]
+    _write_registry(tmp_path / "registry.yml", "first, edited")
+    registry.load()
+
+    assert [t.dirty for t in registry.targets] == [True, False]
+    assert registry.bits[1] is second_bit
+    _render_tex(registry)
+    assert (tmp_path / "out" / "first.tex").read_text() == "first, edited"
+
+
+def test_failed_targets_stay_dirty(tmp_path):
+    registry = _registry(tmp_path)
+    with patch("bits.target.Target.prepare", side_effect=RuntimeError("boom")):
+        try:
+            _render_tex(registry)
+        except Exception:  # pylint: disable=broad-except
+            pass
+    registry.load()
+    assert [t.dirty for t in registry.targets] == [True, True]
+
+
+def test_registry_edit_renders_only_dirty_targets(tmp_path):
+    registry = _registry(tmp_path)
+    _render_tex(registry)
+
+    _write_registry(tmp_path / "registry.yml", "first, edited")
+    registry.load()
+    with patch("bits.target.Target.prepare", autospec=True, return_value=[]) as prepare:
+        registry.render(
+            tex=True, only_dirty=True, changed_paths=[tmp_path / "registry.yml"]
+        )
+
+    assert [call.args[0].name for call in prepare.call_args_list] == ["first"]
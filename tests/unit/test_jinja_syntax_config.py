@@ -1,4 +1,6 @@
 # pylint: disable=protected-access
+from unittest.mock import patch
+
 import pytest
 
 from bits.config import config
@@ -107,3 +109,22 @@ def test_unknown_and_malformed_syntax_options_do_not_break_rendering():
 
     assert rendered == "Ada"
     assert env.trim_blocks is True
+
+
+def test_environment_key_is_recomputed_only_when_config_changes():
+    first = EnvironmentFactory.get()
+
+    with patch.object(
+        EnvironmentFactory, "_get_syntax_options", side_effect=AssertionError
+    ):
+        assert EnvironmentFactory.get() is first
+
+    generation = config.generation
+    _set_syntax(variable_start_string="<<", variable_end_string=">>")
+    assert config.generation > generation
+    assert EnvironmentFactory.get() is not first
+
+    EnvironmentFactory.enable_plugins(True)
+    with_plugins = EnvironmentFactory.get()
+    EnvironmentFactory.enable_plugins(False)
+    assert EnvironmentFactory.get() is not with_plugins
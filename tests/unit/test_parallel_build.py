@@ -0,0 +1,116 @@
+import os
+import subprocess
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from bits.exceptions import BuildFailuresError, LatexRenderError
+from bits.helpers import tmpdir
+from bits.registry import RegistryFactory
+from bits.renderer import Renderer
+
+
+def _fake_pdflatex(cmd, cwd=None, **kwargs):
+    tex_file = Path(cwd) / cmd[-1]
+    if "FAIL" in tex_file.read_text():
+        (Path(cwd) / tex_file.with_suffix(".log").name).write_text("! Broken.\n")
+        raise subprocess.CalledProcessError(1, cmd)
+    tex_file.with_suffix(".pdf").write_text("PDF")
+    return 0
+
+
+def _jobs(tmp_path, count, failing=()):
+    return [
+        {
+            "target": f"t{i}",
+            "tex_code": f"doc {i} {'FAIL' if i in failing else ''}",
+            "dest": tmp_path / "out" / f"t{i}.pdf",
+        }
+        for i in range(count)
+    ]
+
+
+def test_render_many_collects_failures_without_stopping(tmp_path):
+    jobs = _jobs(tmp_path, 4, failing={0, 2})
+
+    with patch("subprocess.check_call", side_effect=_fake_pdflatex):
+        failures = Renderer.render_many(
+            jobs, max_workers=1, build_dir=tmp_path / "_tmp"
+        )
+
+    assert [job["target"] for job, _ in failures] == ["t0", "t2"]
+    assert all(isinstance(err, LatexRenderError) for _, err in failures)
+    assert (tmp_path / "out" / "t1.pdf").exists()
+    assert (tmp_path / "out" / "t3.pdf").exists()
+
+
+def test_render_many_compiles_concurrently(tmp_path):
+    jobs = _jobs(tmp_path, 6, failing={5})
+
+    with patch("subprocess.check_call", side_effect=_fake_pdflatex):
+        failures = Renderer.render_many(jobs, max_workers=3)
+
+    assert [job["target"] for job, _ in failures] == ["t5"]
+    for i in range(5):
+        assert (tmp_path / "out" / f"t{i}.pdf").read_text() == "PDF"
+
+
+def test_tmpdir_leaves_cwd_untouched(tmp_path):
+    cwd = os.getcwd()
+    with tmpdir(dir=tmp_path, prefix="job-") as work_dir:
+        assert os.getcwd() == cwd
+        assert work_dir.parent == tmp_path
+        assert work_dir.name.startswith("job-")
+    assert not work_dir.exists()
+
+
+def test_render_is_safe_from_many_threads(tmp_path):
+    cwd = os.getcwd()
+    build_dir = tmp_path / "_tmp"
+    # Same stem in every thread: they contend for one work dir under build_dir
+    dests = [tmp_path / f"out{i}" / "doc.pdf" for i in range(8)]
+    seen_cwds = set()
+
+    def fake_check_call(cmd, cwd=None, **kwargs):
+        seen_cwds.add(os.getcwd())
+        tex_file = Path(cwd) / cmd[-1]
+        tex_file.with_suffix(".pdf").write_text(tex_file.read_text())
+        return 0
+
+    def _render(i):
+        Renderer.render(f"doc {i}", dests[i], build_dir=build_dir)
+
+    with patch("subprocess.check_call", side_effect=fake_check_call):
+        threads = [threading.Thread(target=_render, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert seen_cwds == {cwd}
+    for i, dest in enumerate(dests):
+        assert dest.read_text() == f"doc {i}"
+
+
+def test_registry_render_reports_all_failed_targets(tmp_path):
+    (tmp_path / "doc.tex.j2").write_text("\\VAR{ body }")
+    (tmp_path / "registry.yml").write_text(
+        "targets:\n"
+        + "".join(
+            f"  - name: {name}\n"
+            f"    template: ./doc.tex.j2\n"
+            f"    dest: ./out\n"
+            f"    context: {{ body: '{body}' }}\n"
+            for name, body in [("ok", "fine"), ("bad1", "FAIL 1"), ("bad2", "FAIL 2")]
+        )
+    )
+    registry = RegistryFactory.get(tmp_path / "registry.yml")
+
+    with patch("subprocess.check_call", side_effect=_fake_pdflatex):
+        with pytest.raises(BuildFailuresError) as exc:
+            registry.render(pdf=True, jobs=1, build_dir=tmp_path / "_tmp")
+
+    assert [name for name, _ in exc.value.failures] == ["bad1", "bad2"]
+    assert (tmp_path / "out" / "ok.pdf").exists()
@@ -0,0 +1,115 @@
+import os
+import re
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from typer.testing import CliRunner
+
+from bits.cache import CACHES, FormatCache, PdfCache, parse_size
+from bits.cli.main import app
+from bits.config import config
+from bits.env import EnvironmentFactory
+from bits.registry.registryfile import RegistryFile
+from bits.renderer import Renderer
+
+
+@pytest.fixture
+def cache_config(tmp_path):
+    original = (
+        dict(config.items("cache", raw=True)) if config.has_section("cache") else None
+    )
+    if not config.has_section("cache"):
+        config.add_section("cache")
+    config.set("cache", "dir", str(tmp_path / "cache"))
+
+    yield tmp_path / "cache"
+
+    config.remove_section("cache")
+    if original is not None:
+        config.add_section("cache")
+        for key, value in original.items():
+            config.set("cache", key, value)
+
+
+def _write_pdf(path: Path, size: int) -> Path:
+    path.write_bytes(b"%" * size)
+    return path
+
+
+def test_parse_size():
+    assert parse_size("512") == 512
+    assert parse_size("2kb") == 2048
+    assert parse_size("1.5M") == int(1.5 * 1024**2)
+    assert parse_size("") is None
+    with pytest.raises(ValueError):
+        parse_size("lots")
+
+
+def test_store_and_fetch_roundtrip(tmp_path):
+    cache = PdfCache(tmp_path / "pdf")
+    key = PdfCache.make_key("tex", "pdflatex:1")
+    cache.store(key, _write_pdf(tmp_path / "a.pdf", 10))
+
+    dest = tmp_path / "out" / "copy.pdf"
+    assert cache.fetch(key, dest)
+    assert dest.read_bytes() == b"%" * 10
+    assert not cache.fetch(PdfCache.make_key("tex", "pdflatex:2"), dest)
+
+
+def test_prune_evicts_least_recently_used(tmp_path):
+    cache = PdfCache(tmp_path / "pdf")
+    keys = [PdfCache.make_key(f"tex{i}", "e") for i in range(3)]
+    for i, key in enumerate(keys):
+        cache.store(key, _write_pdf(tmp_path / f"{i}.pdf", 100))
+        entry = cache._entry_path(key)  # pylint: disable=protected-access
+        os.utime(entry, (1000 + i, 1000 + i))
+
+    # Touch the oldest entry: it becomes the most recently used
+    assert cache.fetch(keys[0], tmp_path / "hit.pdf")
+
+    assert cache.prune(200) == 1
+    assert cache.fetch(keys[0], tmp_path / "x.pdf")
+    assert not cache.fetch(keys[1], tmp_path / "x.pdf")
+    assert cache.stats()["entries"] == 2
+
+
+def test_renderer_reuses_cached_pdf_without_compiling(cache_config, tmp_path):
+    tex_code = r"\documentclass{article}\begin{document}Cached\end{document}"
+    dest = tmp_path / "first" / "doc.pdf"
+
+    def fake_check_call(cmd, cwd=None, **kwargs):
+        (Path(cwd) / "doc.pdf").write_text("PDF")
+        return 0
+
+    with patch("subprocess.check_call", side_effect=fake_check_call) as first:
+        Renderer.render(tex_code, dest, build_dir=tmp_path / "_tmp")
+    assert first.call_count == 1
+
+    other_dest = tmp_path / "second" / "doc.pdf"
+    with patch("subprocess.check_call") as second:
+        Renderer.render(tex_code, other_dest, build_dir=tmp_path / "_tmp")
+    second.assert_not_called()
+    assert other_dest.read_text() == "PDF"
+    assert PdfCache.from_config().stats()["entries"] == 1
+
+
+def test_cache_commands_cover_every_cache(cache_config, tmp_path):
+    PdfCache.from_config().store("ab", _write_pdf(tmp_path / "a.pdf", 10))
+    FormatCache.from_config().store("cd", _write_pdf(tmp_path / "a.fmt", 10))
+    (tmp_path / "bank.yml").write_text("bits:\n  - name: A\n    src: a\n")
+    RegistryFile(tmp_path / "bank.yml")
+    EnvironmentFactory.clear_cache()
+    EnvironmentFactory.from_string("cached \\VAR{ x }")
+    EnvironmentFactory.clear_cache()
+    runner = CliRunner()
+
+    result = runner.invoke(app, ["cache", "stats"])
+    assert result.exit_code == 0, result.output
+    for name in ("pdf", "fmt", "registry", "jinja"):
+        assert re.search(rf"^{name}:\s+1 entries", result.output, re.M)
+
+    result = runner.invoke(app, ["cache", "prune", "--all"])
+    assert result.exit_code == 0, result.output
+    assert "Removed 4 cached file(s); 0 left" in result.output
+    assert all(cls.from_config().stats()["entries"] == 0 for cls in CACHES)
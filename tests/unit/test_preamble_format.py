@@ -0,0 +1,90 @@
+import subprocess
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from bits.config import config
+from bits.renderer import Renderer
+
+PREAMBLE = "\\documentclass{article}\n\\usepackage{tikz}\n"
+
+
+@pytest.fixture
+def precompile_preamble():
+    if not config.has_section("latex"):
+        config.add_section("latex")
+    config.set("latex", "precompile_preamble", "true")
+    yield
+    config.remove_option("latex", "precompile_preamble")
+
+
+class FakePdflatex:
+    """Dump formats on ``-ini`` and record which compiles started from one."""
+
+    def __init__(self, fail_with_format: bool = False):
+        self.dumps = 0
+        self.compiles: list[tuple[str | None, str]] = []
+        self.fail_with_format = fail_with_format
+
+    def __call__(self, cmd, cwd=None, **kwargs):
+        work_dir = Path(cwd)
+        if "-ini" in cmd:
+            self.dumps += 1
+            jobname = next(a for a in cmd if a.startswith("-jobname="))
+            (work_dir / f"{jobname.split('=', 1)[1]}.fmt").write_text("FMT")
+            return 0
+        fmt = next((a.split("=", 1)[1] for a in cmd if a.startswith("-fmt=")), None)
+        tex_file = work_dir / cmd[-1]
+        source = tex_file.read_text()
+        self.compiles.append((fmt, source))
+        if fmt is not None:
+            assert (work_dir / f"{fmt}.fmt").exists()
+            if self.fail_with_format:
+                raise subprocess.CalledProcessError(1, cmd)
+        tex_file.with_suffix(".pdf").write_text("PDF")
+        return 0
+
+
+def test_shared_preamble_is_dumped_once(precompile_preamble, tmp_path):
+    fake = FakePdflatex()
+    with patch("subprocess.check_call", side_effect=fake):
+        for i in range(3):
+            body = f"\\begin{{document}}Exercise {i}\\end{{document}}"
+            Renderer.render(PREAMBLE + body, tmp_path / f"ex{i}.pdf", engine="pdflatex")
+
+    assert fake.dumps == 1
+    assert all(fmt is not None for fmt, _ in fake.compiles)
+    assert all(src.startswith("\\begin{document}") for _, src in fake.compiles)
+
+
+def test_falls_back_to_full_source_when_format_breaks(precompile_preamble, tmp_path):
+    preamble = PREAMBLE + "\\usepackage{hyperref}\n"
+    fake = FakePdflatex(fail_with_format=True)
+    with patch("subprocess.check_call", side_effect=fake):
+        Renderer.render(
+            preamble + "\\begin{document}A\\end{document}",
+            tmp_path / "a.pdf",
+            engine="pdflatex",
+        )
+        Renderer.render(
+            preamble + "\\begin{document}B\\end{document}",
+            tmp_path / "b.pdf",
+            engine="pdflatex",
+        )
+
+    assert (tmp_path / "a.pdf").exists() and (tmp_path / "b.pdf").exists()
+    # First build: format attempt then full retry; second build skips the format
+    assert [fmt is not None for fmt, _ in fake.compiles] == [True, False, False]
+    assert fake.compiles[-1][1].startswith(preamble)
+
+
+def test_disabled_by_default(tmp_path):
+    fake = FakePdflatex()
+    with patch("subprocess.check_call", side_effect=fake):
+        Renderer.render(
+            PREAMBLE + "\\begin{document}C\\end{document}",
+            tmp_path / "c.pdf",
+            engine="pdflatex",
+        )
+    assert fake.dumps == 0
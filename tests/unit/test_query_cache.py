@@ -0,0 +1,63 @@
+from unittest.mock import patch
+
+from bits.registry.registryfile import RegistryFile
+
+
+def _write_registry(tmp_path):
+    (tmp_path / "doc.tex.j2").write_text(
+        "\\BLOCK{ for b in blocks }\\VAR{ b.render() };\\BLOCK{ endfor }"
+    )
+    variants = "".join(
+        f"  - name: v{i}\n"
+        "    template: ./doc.tex.j2\n"
+        "    dest: ./out\n"
+        "    queries:\n"
+        "      blocks:\n"
+        "        - where: { tags: [kinematics] }\n"
+        f"          select: {{ indices: [{i}] }}\n"
+        for i in (1, 2, 3)
+    )
+    (tmp_path / "registry.yml").write_text(
+        "bits:\n"
+        + "".join(
+            f"  - name: B{i}\n    tags: [kinematics]\n    src: bit{i}\n"
+            for i in (1, 2, 3)
+        )
+        + "  - name: Other\n    tags: [optics]\n    src: other\n"
+        "targets:\n" + variants
+    )
+    return tmp_path / "registry.yml"
+
+
+def _filter_calls(load):
+    original = RegistryFile._filter_bits_with_where
+    with patch.object(
+        RegistryFile, "_filter_bits_with_where", autospec=True, side_effect=original
+    ) as filter_bits:
+        result = load()
+    return filter_bits.call_count, result
+
+
+def test_repeated_queries_filter_once_and_select_per_target(tmp_path):
+    path = _write_registry(tmp_path)
+
+    calls, registry = _filter_calls(lambda: RegistryFile(path))
+
+    assert calls == 1
+    assert [t.render_tex_code() for t in registry.targets] == [
+        "bit1;",
+        "bit2;",
+        "bit3;",
+    ]
+
+
+def test_query_cache_lives_for_one_load(tmp_path):
+    path = _write_registry(tmp_path)
+    registry = RegistryFile(path)
+
+    text = path.read_text().replace("src: bit2", "src: changed")
+    path.write_text(text)
+    calls, _ = _filter_calls(registry.load)
+
+    assert calls == 1
+    assert registry.targets[1].render_tex_code() == "changed;"
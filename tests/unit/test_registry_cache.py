@@ -0,0 +1,101 @@
+import configparser
+import json
+import pickle
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from bits.cache import RegistryCache
+from bits.config import config
+from bits.registry.registryfile import RegistryFile
+from bits.registry.registryfile_parsers import RegistryFileYamlParser
+
+
+@pytest.fixture
+def registry_path(tmp_path):
+    path = tmp_path / "bank.yml"
+    path.write_text("bits:\n  - name: A\n    src: ${bank_var}/a\n")
+    if not config.has_section("variables"):
+        config.add_section("variables")
+    config.set("variables", "bank_var", "/first")
+    yield path
+    config.remove_option("variables", "bank_var")
+
+
+def _parse_calls(path):
+    original = RegistryFileYamlParser.parse
+    with patch.object(
+        RegistryFileYamlParser, "parse", autospec=True, side_effect=original
+    ) as parse:
+        registry = RegistryFile(path)
+    return parse.call_count, registry
+
+
+def test_unchanged_registries_skip_parsing(registry_path):
+    assert _parse_calls(registry_path)[0] == 1
+    calls, registry = _parse_calls(registry_path)
+
+    assert calls == 0
+    assert registry.bits[0].src == "/first/a"
+
+
+def test_cache_is_invalidated_by_content_and_variables(registry_path):
+    _parse_calls(registry_path)
+
+    registry_path.write_text(registry_path.read_text() + "tags: [new]\n")
+    calls, registry = _parse_calls(registry_path)
+    assert calls == 1
+    assert registry.bits[0].tags == ["new"]
+
+    config.set("variables", "bank_var", "/second")
+    calls, registry = _parse_calls(registry_path)
+    assert calls == 1
+    assert registry.bits[0].src == "/second/a"
+
+
+def test_corrupt_entries_are_reparsed(registry_path):
+    _parse_calls(registry_path)
+    cache = RegistryCache.from_config()
+    key = cache.make_registry_key(registry_path, registry_path.read_bytes())
+    entry = cache._entry_path(key)  # pylint: disable=protected-access
+    entry.write_bytes(b"not json")
+
+    calls, registry = _parse_calls(registry_path)
+
+    assert calls == 1
+    assert registry.bits[0].name == "A"
+
+
+class _Payload:
+    def __init__(self, marker):
+        self.marker = marker
+
+    def __reduce__(self):
+        return (Path.touch, (self.marker,))
+
+
+def test_entries_are_data_not_code(registry_path, tmp_path):
+    _parse_calls(registry_path)
+    cache = RegistryCache.from_config()
+    key = cache.make_registry_key(registry_path, registry_path.read_bytes())
+    entry = cache._entry_path(key)  # pylint: disable=protected-access
+    assert entry.suffix == ".json"
+    assert json.loads(entry.read_text())["bits"][0]["name"] == "A"
+
+    marker = tmp_path / "executed"
+    entry.write_bytes(pickle.dumps(_Payload(marker)))
+    calls, registry = _parse_calls(registry_path)
+
+    assert not marker.exists()
+    assert calls == 1
+    assert registry.bits[0].name == "A"
+
+
+def test_variable_errors_are_not_left_out_of_the_key(registry_path):
+    config.set("variables", "broken", "${missing}")
+    try:
+        with pytest.raises(configparser.InterpolationError):
+            RegistryCache.make_registry_key(registry_path, b"")
+    finally:
+        config.remove_option("variables", "broken")
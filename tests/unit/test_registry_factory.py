@@ -1,8 +1,9 @@
+import os
 from pathlib import Path
 
 import pytest
 
-from bits.exceptions import RegistryNotFoundError
+from bits.exceptions import RegistryLoadError, RegistryNotFoundError
 from bits.registry.registry_factory import RegistryFactory
 from bits.registry.registryfile import RegistryFile
 
@@ -37,3 +38,142 @@ def test_get_nonexistent_path(tmp_path):
 def test_registry_factory_cache(tmp_path):
     # ...existing code...
     pass
+
+
+def _counting_loads(monkeypatch):
+    loads = []
+    original = RegistryFile.load
+
+    def load(self, *args, **kwargs):
+        loads.append(self._path.name)
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(RegistryFile, "load", load)
+    return loads
+
+
+def _write_bank(tmp_path):
+    (tmp_path / "bank.yml").write_text("bits:\n  - name: a\n    src: A\n")
+    (tmp_path / "main.yml").write_text(
+        "import:\n  - registry: ./bank.yml\n" "bits:\n  - name: b\n    src: B\n"
+    )
+
+
+def test_get_loads_a_new_registry_once(tmp_path, monkeypatch):
+    _write_bank(tmp_path)
+    loads = _counting_loads(monkeypatch)
+
+    RegistryFactory.get(tmp_path / "main.yml")
+
+    assert loads == ["main.yml", "bank.yml"]
+
+
+def test_get_reuses_unchanged_registries(tmp_path, monkeypatch):
+    _write_bank(tmp_path)
+    first = RegistryFactory.get(tmp_path / "main.yml")
+    loads = _counting_loads(monkeypatch)
+
+    assert RegistryFactory.get(tmp_path / "main.yml") is first
+    assert loads == []
+
+
+def test_get_reloads_when_an_import_changes(tmp_path, monkeypatch):
+    _write_bank(tmp_path)
+    RegistryFactory.get(tmp_path / "main.yml")
+    loads = _counting_loads(monkeypatch)
+
+    (tmp_path / "bank.yml").write_text("bits:\n  - name: a\n    src: AA\n")
+    registry = RegistryFactory.get(tmp_path / "main.yml")
+
+    assert loads == ["main.yml", "bank.yml"]
+    assert registry.bits.query(name="a")[0].src == "AA"
+
+
+def test_get_ignores_touched_but_identical_files(tmp_path, monkeypatch):
+    _write_bank(tmp_path)
+    RegistryFactory.get(tmp_path / "main.yml")
+    loads = _counting_loads(monkeypatch)
+
+    stat = (tmp_path / "main.yml").stat()
+    os.utime(tmp_path / "main.yml", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    RegistryFactory.get(tmp_path / "main.yml")
+
+    assert loads == []
+
+
+def test_dependency_checked_once_per_generation(tmp_path, monkeypatch):
+    _write_bank(tmp_path)
+    (tmp_path / "other.yml").write_text("import:\n  - registry: ./bank.yml\n")
+    RegistryFactory.get(tmp_path / "main.yml")
+    bank = RegistryFactory.get(tmp_path / "bank.yml", as_dep=True)
+    checks = []
+    original = bank._files_unchanged
+
+    def files_unchanged():
+        checks.append(1)
+        return original()
+
+    monkeypatch.setattr(bank, "_files_unchanged", files_unchanged)
+    RegistryFactory.refresh()
+    RegistryFactory.get(tmp_path / "bank.yml", as_dep=True)
+    RegistryFactory.get(tmp_path / "bank.yml", as_dep=True)
+
+    assert len(checks) == 1
+
+
+def _write_querier(tmp_path):
+    (tmp_path / "doc.tex.j2").write_text("x")
+    (tmp_path / "bank.yml").write_text("bits:\n  - name: A\n    src: a\n")
+    (tmp_path / "main.yml").write_text(
+        "targets:\n"
+        "  - name: t\n"
+        "    template: ./doc.tex.j2\n"
+        "    dest: ./out\n"
+        "    context:\n"
+        "      blocks:\n"
+        "        - registry: ./bank.yml\n"
+        "          query: { name: A }\n"
+    )
+
+
+def test_querier_is_stale_after_its_bank_reloads(tmp_path):
+    _write_querier(tmp_path)
+    main = RegistryFactory.get(tmp_path / "main.yml")
+    assert main.is_fresh(as_dep=False)
+
+    # Another top-level build reloads the queried bank
+    RegistryFactory.get(tmp_path / "bank.yml")
+
+    assert not main.is_fresh(as_dep=False)
+
+
+def test_querier_reloads_when_its_bank_changes(tmp_path):
+    _write_querier(tmp_path)
+    main = RegistryFactory.get(tmp_path / "main.yml")
+
+    (tmp_path / "bank.yml").write_text("bits:\n  - name: A\n    src: changed\n")
+    main = RegistryFactory.get(tmp_path / "main.yml")
+
+    block = main.targets[0].context["blocks"][0]
+    assert block.bit.src == "changed"
+
+
+def test_failed_load_is_not_fresh_after_revert(tmp_path):
+    bank = tmp_path / "bank.yml"
+    original = "bits:\n  - name: A\n    src: a\n"
+    bank.write_text(original)
+    (tmp_path / "index.yml").write_text(
+        "import:\n  - registry: ./bank.yml\nbits:\n  - name: I\n    src: i\n"
+    )
+    index = RegistryFactory.get(tmp_path / "index.yml")
+
+    bank.write_text(
+        original + "  - name: B\n    src: b\n    defaults:\n      constants:\n"
+        "        - registry: ./missing.yml\n          query: { name: x }\n"
+    )
+    with pytest.raises(RegistryLoadError):
+        index.load()
+    bank.write_text(original)
+    index.load()
+
+    assert [bit.name for bit in index.bits] == ["I", "A"]
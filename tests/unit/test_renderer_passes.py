@@ -0,0 +1,65 @@
+from pathlib import Path
+from unittest.mock import patch
+
+from bits.renderer import Renderer
+
+
+def _fake_pdflatex_with_refs(cmd, cwd=None, **kwargs):
+    """Mimic a document whose references settle on the second pass."""
+    work_dir = Path(cwd)
+    stem = Path(cmd[-1]).stem
+    aux = work_dir / f"{stem}.aux"
+    previous = aux.read_text() if aux.exists() else ""
+    current = "refs-v2" if previous else "refs-v1"
+    aux.write_text(current)
+    log = "Output written.\n"
+    if current != previous:
+        log += "LaTeX Warning: Label(s) may have changed. Rerun to get cross-references right.\n"
+    (work_dir / f"{stem}.log").write_text(log)
+    (work_dir / f"{stem}.pdf").write_text("PDF")
+    return 0
+
+
+def test_reruns_until_aux_files_converge(tmp_path):
+    dest = tmp_path / "doc.pdf"
+    with patch("subprocess.check_call", side_effect=_fake_pdflatex_with_refs) as call:
+        Renderer.render("cold build", dest, build_dir=tmp_path / "_tmp")
+    # v1 -> v2 -> v2: the third pass confirms convergence
+    assert call.call_count == 3
+    assert (tmp_path / "_tmp" / "doc" / "doc.aux").read_text() == "refs-v2"
+
+
+def test_warm_rebuild_reuses_aux_files(tmp_path):
+    dest = tmp_path / "doc.pdf"
+    build_dir = tmp_path / "_tmp"
+    with patch("subprocess.check_call", side_effect=_fake_pdflatex_with_refs):
+        Renderer.render("first build", dest, build_dir=build_dir)
+
+    with patch("subprocess.check_call", side_effect=_fake_pdflatex_with_refs) as call:
+        Renderer.render("edited build", dest, build_dir=build_dir)
+    assert call.call_count == 1
+
+
+def test_max_passes_caps_reruns(tmp_path):
+    dest = tmp_path / "doc.pdf"
+    with patch("subprocess.check_call", side_effect=_fake_pdflatex_with_refs) as call:
+        Renderer.render("capped build", dest, build_dir=tmp_path / "_tmp", max_passes=2)
+    assert call.call_count == 2
+
+
+def _fake_pdflatex_plain(cmd, cwd=None, **kwargs):
+    """A document without references: LaTeX still writes an .aux file."""
+    work_dir = Path(cwd)
+    stem = Path(cmd[-1]).stem
+    (work_dir / f"{stem}.aux").write_text("\\relax")
+    (work_dir / f"{stem}.log").write_text("Output written.\n")
+    (work_dir / f"{stem}.pdf").write_text("PDF")
+    return 0
+
+
+def test_plain_document_compiles_in_one_pass(tmp_path):
+    dest = tmp_path / "doc.pdf"
+    with patch("subprocess.check_call", side_effect=_fake_pdflatex_plain) as call:
+        Renderer.render("plain", dest)
+    assert call.call_count == 1
+    assert dest.read_text() == "PDF"
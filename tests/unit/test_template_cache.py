@@ -0,0 +1,42 @@
+# pylint: disable=protected-access
+import pytest
+
+from bits.bit import Bit
+from bits.config import config
+from bits.env import EnvironmentFactory
+
+
+@pytest.fixture(autouse=True)
+def fresh_template_cache():
+    EnvironmentFactory.clear_cache()
+    yield
+    if config.has_option("jinja", "template_cache_size"):
+        config.remove_option("jinja", "template_cache_size")
+    EnvironmentFactory.clear_cache()
+
+
+def test_identical_sources_share_one_compiled_template():
+    first = Bit(src="Same \\VAR{ x }", defaults={"x": 1})
+    second = Bit(src={"default": "Same \\VAR{ x }"}, defaults={"x": 2})
+
+    assert first.render() == "Same 1"
+    assert second.render() == "Same 2"
+    assert first._templates[None] is second._templates["default"]
+    assert len(EnvironmentFactory._template_cache) == 1
+
+
+def test_template_cache_is_bounded_and_dropped_with_environments():
+    if not config.has_section("jinja"):
+        config.add_section("jinja")
+    config.set("jinja", "template_cache_size", "2")
+
+    first = EnvironmentFactory.from_string("one")
+    EnvironmentFactory.from_string("two")
+    assert EnvironmentFactory.from_string("one") is first
+    EnvironmentFactory.from_string("three")
+
+    sources = {t.render() for t in EnvironmentFactory._template_cache.values()}
+    assert sources == {"one", "three"}
+
+    EnvironmentFactory.clear_cache()
+    assert EnvironmentFactory.from_string("one") is not first
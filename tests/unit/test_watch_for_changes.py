@@ -1,6 +1,7 @@
 from types import SimpleNamespace
 
 from bits.cli.helpers import watch_for_changes
+from bits.watcher import ChangeBatch
 
 
 class DummyRegistry:
@@ -87,3 +88,25 @@ def test_watch_for_changes_ignores_irrelevant_files(tmp_path):
 
     assert registry.load_calls == []
     assert registry.render_calls == []
+
+
+def test_watch_for_changes_rebuilds_once_per_batch(tmp_path):
+    registry = DummyRegistry()
+    console = DummyConsole()
+
+    watch_for_changes(
+        registry,
+        console,
+        output_tex=False,
+        build_dir=tmp_path / "build",
+        loop=False,
+    )
+    registry.listener(
+        ChangeBatch(
+            SimpleNamespace(src_path=path) for path in ["a.yml", "notes.txt", "b.md"]
+        )
+    )
+
+    assert registry.load_calls == [False]
+    assert len(registry.render_calls) == 1
+    assert registry.render_calls[0]["changed_paths"] == ["a.yml", "b.md"]
@@ -0,0 +1,179 @@
+import threading
+
+import pytest
+from watchdog.events import FileModifiedEvent
+
+from bits import watcher as watcher_module
+from bits.config import config
+from bits.registry.registry_factory import RegistryFactory
+from bits.watcher import ChangeQueue, Watcher, WatchService
+
+
+class FakeObserver:
+    instances = []
+
+    def __init__(self):
+        self.scheduled = []
+        self.running = False
+        FakeObserver.instances.append(self)
+
+    def schedule(self, handler, path, recursive=False):
+        self.scheduled.append(path)
+
+    def start(self):
+        self.running = True
+
+    def stop(self):
+        self.running = False
+
+    def join(self):
+        pass
+
+
+@pytest.fixture
+def service(monkeypatch):
+    FakeObserver.instances = []
+    monkeypatch.setattr(watcher_module, "Observer", FakeObserver)
+    # Long quiet window: tests flush the queue themselves
+    service = WatchService(quiet=60)
+    monkeypatch.setattr(watcher_module, "watch_service", service)
+    return service
+
+
+def _bank(tmp_path, name):
+    path = tmp_path / f"{name}.yml"
+    path.write_text(f"bits:\n  - name: {name}\n    src: {name}\n")
+    return path
+
+
+def test_loading_registries_starts_no_observer(tmp_path, service):
+    (tmp_path / "index.yml").write_text(
+        "import:\n  - registry: ./a.yml\n  - registry: ./b.yml\n"
+    )
+    _bank(tmp_path, "a")
+    _bank(tmp_path, "b")
+
+    RegistryFactory.get(tmp_path / "index.yml")
+
+    assert FakeObserver.instances == []
+    assert not service.running
+
+
+def test_watched_registries_share_one_observer(tmp_path, service):
+    (tmp_path / "sub").mkdir()
+    watchers = [
+        Watcher(_bank(tmp_path, "a")),
+        Watcher(_bank(tmp_path, "b")),
+        Watcher(_bank(tmp_path / "sub", "c")),
+    ]
+    for watcher in watchers:
+        watcher.start()
+    watchers[0].start()
+
+    assert len(FakeObserver.instances) == 1
+    observer = FakeObserver.instances[0]
+    assert sorted(observer.scheduled) == [str(tmp_path), str(tmp_path / "sub")]
+
+    for watcher in watchers:
+        watcher.stop()
+    assert not observer.running
+    assert not service.running
+
+
+def test_events_reach_only_the_owning_registries(tmp_path, service):
+    template = tmp_path / "doc.tex.j2"
+    template.write_text("x")
+    a, b = Watcher(_bank(tmp_path, "a")), Watcher(_bank(tmp_path, "b"))
+    a.watch_files([template])
+    b.watch_files([template])
+    events = {"a": [], "b": []}
+    a.add_listener(lambda batch: events["a"].append(batch.paths))
+    b.add_listener(lambda batch: events["b"].append(batch.paths))
+    a.start()
+    b.start()
+
+    service.on_modified(FileModifiedEvent(str(tmp_path / "a.yml")))
+    service.on_modified(FileModifiedEvent(str(template)))
+    service.on_modified(FileModifiedEvent(str(tmp_path / "notes.txt")))
+    service.flush()
+
+    assert events["a"] == [[str(tmp_path / "a.yml"), str(template)]]
+    assert events["b"] == [[str(template)]]
+    a.stop()
+    b.stop()
+
+
+def test_listener_on_several_watchers_gets_one_batch(tmp_path, service):
+    a, b = Watcher(_bank(tmp_path, "a")), Watcher(_bank(tmp_path, "b"))
+    batches = []
+    for watcher in (a, b):
+        watcher.add_listener(batches.append)
+        watcher.start()
+
+    for name in ("a", "b", "a"):
+        service.on_modified(FileModifiedEvent(str(tmp_path / f"{name}.yml")))
+    service.flush()
+
+    assert [batch.paths for batch in batches] == [
+        [str(tmp_path / "b.yml"), str(tmp_path / "a.yml")]
+    ]
+    a.stop()
+    b.stop()
+
+
+def test_queue_waits_for_quiet_window_and_dedupes(tmp_path):
+    batches = []
+    done = threading.Event()
+
+    def handle(batch):
+        batches.append(batch.paths)
+        done.set()
+
+    queue = ChangeQueue(handle, quiet=0.2)
+    for name in ("a", "b", "a", "c"):
+        queue.put(FileModifiedEvent(str(tmp_path / name)))
+    assert done.wait(5)
+    queue.stop()
+
+    assert batches == [[str(tmp_path / n) for n in ("b", "a", "c")]]
+
+
+def test_events_during_a_build_form_the_next_batch(tmp_path):
+    batches = []
+    building = threading.Event()
+    release = threading.Event()
+    second = threading.Event()
+    active = []
+
+    def handle(batch):
+        active.append(1)
+        assert len(active) == 1, "builds overlap"
+        batches.append(batch.paths)
+        if len(batches) == 1:
+            building.set()
+            release.wait(5)
+        else:
+            second.set()
+        active.pop()
+
+    queue = ChangeQueue(handle, quiet=0.05)
+    queue.put(FileModifiedEvent(str(tmp_path / "a")))
+    assert building.wait(5)
+    for name in ("b", "c", "b"):
+        queue.put(FileModifiedEvent(str(tmp_path / name)))
+    release.set()
+    assert second.wait(5)
+    queue.stop()
+
+    assert batches == [[str(tmp_path / "a")], [str(tmp_path / n) for n in ("c", "b")]]
+
+
+def test_debounce_is_configurable():
+    if not config.has_section("watch"):
+        config.add_section("watch")
+    config.set("watch", "debounce", "0.25")
+    try:
+        assert ChangeQueue(lambda batch: None).quiet == 0.25
+    finally:
+        config.remove_option("watch", "debounce")
+    assert ChangeQueue(lambda batch: None).quiet == 1.0
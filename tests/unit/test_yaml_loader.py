@@ -0,0 +1,40 @@
+import pytest
+
+from bits.config import config
+from bits.yaml_loader import BitsLoader, PyBitsLoader, load_yaml
+
+SRC = """
+root: ${bench_root}/templates
+quoted: "${bench_root}"
+inline: see ${bench_root}
+unknown: ${missing_var}
+tagged: !var "prefix ${bench_root}"
+items:
+  - ${bench_root}
+  - { nested: "${bench_root}/x" }
+number: 3
+"""
+
+
+@pytest.fixture
+def bench_root(tmp_path):
+    if not config.has_section("variables"):
+        config.add_section("variables")
+    config.set("variables", "bench_root", str(tmp_path))
+    yield str(tmp_path)
+    config.remove_option("variables", "bench_root")
+
+
+@pytest.mark.parametrize("loader", [BitsLoader, PyBitsLoader])
+def test_variables_are_interpolated_in_strings(bench_root, loader):
+    data = load_yaml(SRC, loader=loader)
+
+    assert data == {
+        "root": f"{bench_root}/templates",
+        "quoted": bench_root,
+        "inline": "see ${bench_root}",
+        "unknown": "${missing_var}",
+        "tagged": f"prefix {bench_root}",
+        "items": [bench_root, {"nested": f"{bench_root}/x"}],
+        "number": 3,
+    }